@@ -4,13 +4,23 @@ A lightweight service that enables AI assistants to execute Zoo commands through
 """
 
 import asyncio
+import contextvars
+import functools
 import logging
+import random
 import ssl
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from importlib.metadata import PackageNotFoundError, version
 
+import httpx
 import truststore
 from kittycad import KittyCAD
+from kittycad.exceptions import (
+    KittyCADAPIError,
+    KittyCADConnectionError,
+    KittyCADTimeoutError,
+)
 
 FORMAT = "%(asctime)s | %(levelname)-7s | %(filename)s:%(lineno)d | %(funcName)s | %(message)s"
 
@@ -32,9 +42,115 @@ class ZooMCPException(Exception):
 
 
 ctx = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-kittycad_client = KittyCAD(verify_ssl=ctx)
-# set the websocket receive timeout to 5 minutes
-kittycad_client.websocket_recv_timeout = 300
+
+
+@functools.cache
+def get_kittycad_client() -> KittyCAD:
+    """Return the shared KittyCAD client, creating it on first use.
+
+    The client reads credentials from the environment when constructed, so building it lazily keeps importing
+    zoo_mcp cheap and lets modules be imported without an API token configured.
+    """
+    client = KittyCAD(verify_ssl=ctx)
+    # set the websocket receive timeout to 5 minutes
+    client.websocket_recv_timeout = 300
+    # share one keep-alive connection pool across every SDK call (including calls made from worker threads), so
+    # polling a job reuses the TLS connection, and retry failed connects at the transport level
+    limits = httpx.Limits(max_keepalive_connections=16, max_connections=32)
+    client.http_client = httpx.Client(
+        timeout=httpx.Timeout(client.timeout, connect=10.0),
+        transport=httpx.HTTPTransport(verify=ctx, limits=limits, retries=2),
+    )
+    return client
+
+
+# blocking SDK calls wait on the network, not the CPU, so give them their own pool sized to the connection pool's
+# keep-alive limit rather than queueing behind file hashing and image work in the default executor
+_api_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="zoo-api")
+
+
+def close_api_executor() -> None:
+    """Stop the SDK thread pool, dropping calls that have not started yet.
+
+    Calls already running are left to finish, so shutting the server down is only held up by those and not by the
+    uploads queued behind them.
+    """
+    _api_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _is_transient(error: Exception, idempotent: bool = True) -> bool:
+    """Return whether a failed SDK call is worth retrying.
+
+    Network failures, timeouts, rate limiting and server-side errors are transient; anything else, such as a
+    rejected request or a missing file, fails the same way on every attempt. A call that is not idempotent is only
+    retried when it failed to connect, since any later failure may come after the server acted on the request.
+    """
+    if not idempotent:
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+    if isinstance(error, KittyCADAPIError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(
+        error,
+        (
+            httpx.TransportError,
+            KittyCADConnectionError,
+            KittyCADTimeoutError,
+            ConnectionError,
+            TimeoutError,
+        ),
+    )
+
+
+async def call_with_retry(
+    fn,
+    *args,
+    max_retries: int = 3,
+    backoff_base: float = 1.0,
+    idempotent: bool = True,
+    **kwargs,
+):
+    """Run a blocking SDK call in the API thread pool, retrying transient failures.
+
+    Args:
+        fn: The blocking callable to run.
+        *args: Positional arguments for ``fn``.
+        max_retries (int): The total number of attempts before the error is raised.
+        backoff_base (float): The delay in seconds before the first retry, doubled for each further retry up to
+            8 seconds, with up to 10% random jitter added.
+        idempotent (bool): Whether repeating the call is harmless. Calls that create something, such as a
+            Text-To-CAD job, should pass False so they are only retried when they could not connect.
+        **kwargs: Keyword arguments for ``fn``.
+
+    Returns:
+        The return value of ``fn``.
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(max_retries):
+        try:
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(
+                _api_executor, functools.partial(context.run, fn, *args, **kwargs)
+            )
+        except Exception as e:
+            if attempt == max_retries - 1 or not _is_transient(e, idempotent):
+                raise
+            delay = min(8.0, backoff_base * 2**attempt)
+            delay += random.uniform(0, delay / 10)
+            logger.warning(
+                "Transient error calling %s, retrying in %.2fs: %s",
+                fn.__name__,
+                delay,
+                e,
+            )
+            await asyncio.sleep(delay)
+
+
+def __getattr__(name: str):
+    # keep `from zoo_mcp import kittycad_client` working without constructing the client at import time
+    if name == "kittycad_client":
+        return get_kittycad_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 httpx_logger = logging.getLogger("httpx")
 httpx_logger.setLevel(logging.WARNING)
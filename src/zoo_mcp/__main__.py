@@ -1,12 +1,12 @@
 import sys
 
 from zoo_mcp import logger
-from zoo_mcp.server import mcp
+from zoo_mcp.server import run_stdio
 
 if __name__ == "__main__":
     try:
         logger.info("Starting MCP server...")
-        mcp.run(transport="stdio")
+        run_stdio()
 
     except KeyboardInterrupt:
         logger.info("Shutting down MCP server...")
@@ -1,6 +1,12 @@
 import asyncio
-import time
+import hashlib
+import os
+import random
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TypeVar
 
 from kittycad._io_types import SyncUpload
 from kittycad.models import (
@@ -29,12 +35,131 @@ from kittycad.models.text_to_cad_response import (
 )
 from websockets.exceptions import ConnectionClosedError
 
-from zoo_mcp import ZooMCPException, kittycad_client, logger
+from zoo_mcp import ZooMCPException, call_with_retry, get_kittycad_client, logger
+
+# maximum number of completed Text-To-CAD responses kept in memory, 0 disables the cache
+_CACHE_SIZE = int(os.environ.get("ZOO_MCP_CACHE_SIZE", "256"))
+_t2c_cache: OrderedDict[str, str | dict] = OrderedDict()
+# requests currently running, keyed like the response cache, so identical concurrent requests share one job
+_inflight: dict[str, asyncio.Task] = {}
+
+# statuses after which a Text-To-CAD job will not change any more
+_TERMINAL_STATUSES = frozenset((ApiCallStatus.COMPLETED, ApiCallStatus.FAILED))
+
+# the attribute holding the output of a completed job, for each Text-To-CAD response variant
+_RESULT_ATTRS: dict[type, str] = {
+    OptionTextToCad: "code",
+    OptionTextToCadMultiFileIteration: "outputs",
+}
+
+# maximum number of project files held open at once while reading attachments
+_MAX_OPEN_FILES = 32
+
+_T = TypeVar("_T")
+
+
+def _cache_key(*parts: str | bytes) -> str:
+    """Build a content-addressed cache key from the inputs of a Text-To-CAD request."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode() if isinstance(part, str) else part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _cache_get(key: str) -> str | dict | None:
+    """Return a cached Text-To-CAD response and mark it as most recently used."""
+    if key not in _t2c_cache:
+        return None
+    _t2c_cache.move_to_end(key)
+    return _t2c_cache[key]
+
+
+def _cache_put(key: str, value: str | dict) -> None:
+    """Store a completed Text-To-CAD response, evicting the least recently used entry."""
+    if _CACHE_SIZE <= 0:
+        return
+    _t2c_cache[key] = value
+    _t2c_cache.move_to_end(key)
+    while len(_t2c_cache) > _CACHE_SIZE:
+        _t2c_cache.popitem(last=False)
+
+
+async def _run_once(key: str, work: Callable[[], Coroutine]):
+    """Run ``work`` unless an identical request is already in flight, in which case wait for its result instead.
+
+    The request runs in its own task, so the caller that started it can be cancelled, for example by its MCP client
+    disconnecting, without cancelling it for anyone else waiting on the same result.
+
+    Args:
+        key (str): The cache key identifying the request.
+        work (Callable[[], Coroutine]): Starts the request when called.
+
+    Returns:
+        The result of the request.
+    """
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.create_task(work())
+        _inflight[key] = task
+
+        def forget(done: asyncio.Task) -> None:
+            if _inflight.get(key) is done:
+                del _inflight[key]
+            # mark a failure as retrieved in case every caller stopped waiting before it happened
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(forget)
+    else:
+        logger.info("Waiting on an identical in-flight Text-To-CAD request")
+    # shield the shared request so one caller being cancelled does not cancel it for the others
+    return await asyncio.shield(task)
+
+
+def _discover_files(proj_path: Path) -> tuple[list[Path], list[str]]:
+    """List every regular file under a project directory along with its path relative to the project.
+
+    Directory entries usually carry their type from the listing itself, so most entries need no stat. Symlinks to
+    files are followed, while FIFOs, sockets, dangling symlinks and symlinked directories are skipped, as are
+    directories that cannot be read.
+    """
+    file_paths: list[Path] = []
+    rel_paths: list[str] = []
+    pending = [(os.fspath(proj_path), "")]
+    while pending:
+        directory, rel_dir = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    rel_path = (
+                        os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                    )
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, rel_path))
+                    elif entry.is_file():
+                        file_paths.append(Path(entry.path))
+                        rel_paths.append(rel_path)
+        except OSError:
+            continue
+    return file_paths, rel_paths
+
+
+def _file_digest(fp: Path) -> bytes:
+    """Hash a file in chunks so it is never held in memory as a whole."""
+    with open(fp, "rb") as inp:
+        return hashlib.file_digest(inp, "sha256").digest()
+
+
+async def _hash_attachment(fp: Path, semaphore: asyncio.Semaphore) -> bytes:
+    """Hash a project file in a worker thread, bounded by the shared semaphore."""
+    async with semaphore:
+        return await asyncio.to_thread(_file_digest, fp)
 
 
 def log_websocket_message(conn_id: str) -> bool:
     logger.info("Connecting to Text-To-CAD websocket...")
-    with kittycad_client.ml.ml_reasoning_ws(id=conn_id) as ws:
+    with get_kittycad_client().ml.ml_reasoning_ws(id=conn_id) as ws:
         logger.info(
             "Successfully connected to Text-To-CAD websocket with id %s", conn_id
         )
@@ -116,49 +241,141 @@ def log_websocket_message(conn_id: str) -> bool:
                 return False
 
 
-async def text_to_cad(prompt: str) -> str:
-    """Send a prompt to Zoo's Text-To-CAD create endpoint
+@dataclass
+class _WatchedJob:
+    """A Text-To-CAD job being waited on, with its own polling backoff."""
+
+    future: asyncio.Future
+    delay: float
+    due: float
+
+
+class _JobWaiter:
+    """Poll every outstanding Text-To-CAD job from a single background task.
+
+    Concurrent tool calls register their job with `watch` and await the returned future, rather than each running
+    its own polling loop. Each job keeps its own backoff: the delay between its polls starts at ``initial`` seconds
+    and doubles (with a little jitter) up to ``cap`` seconds, so fast jobs return quickly and slow jobs are not
+    hammered with requests. Jobs that are due at the same time are polled concurrently.
+    """
+
+    def __init__(self, initial: float = 0.25, cap: float = 10.0):
+        self.initial = initial
+        self.cap = cap
+        self._jobs: dict[str, _WatchedJob] = {}
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+
+    def watch(self, job_id: str, poll_now: bool = True) -> asyncio.Future:
+        """Start waiting on a job, returning a future resolved with its terminal response.
+
+        Unless ``poll_now`` is set, the first poll is made after the initial delay rather than straight away.
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is not None and self._task.get_loop() is not loop:
+            # the event loop the poller ran on has gone away along with anything waiting on it
+            self._jobs.clear()
+            self._task = None
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+        job = self._jobs.get(job_id)
+        if job is None:
+            due = loop.time() if poll_now else loop.time() + self.initial
+            job = _WatchedJob(loop.create_future(), self.initial, due)
+            self._jobs[job_id] = job
+            self._wake.set()
+        return job.future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._jobs:
+            self._wake.clear()
+            now = loop.time()
+            due = [job_id for job_id, job in self._jobs.items() if job.due <= now]
+            results = await asyncio.gather(
+                *[
+                    call_with_retry(
+                        get_kittycad_client().ml.get_text_to_cad_part_for_user,
+                        id=job_id,
+                    )
+                    for job_id in due
+                ],
+                return_exceptions=True,
+            )
+            for job_id, result in zip(due, results):
+                job = self._jobs[job_id]
+                if job.future.done():
+                    # the caller stopped waiting
+                    del self._jobs[job_id]
+                elif isinstance(result, BaseException):
+                    del self._jobs[job_id]
+                    job.future.set_exception(result)
+                elif result.root.status in _TERMINAL_STATUSES:
+                    del self._jobs[job_id]
+                    job.future.set_result(result)
+                else:
+                    logger.info(
+                        "Waiting for Text-To-CAD to complete... status %s",
+                        result.root.status,
+                    )
+                    job.due = (
+                        loop.time() + job.delay + random.uniform(0, job.delay * 0.1)
+                    )
+                    job.delay = min(job.delay * 2, self.cap)
+
+            if self._jobs:
+                next_due = min(job.due for job in self._jobs.values())
+                # sleep until the next job is due, waking early if a new job is registered
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), timeout=max(0.0, next_due - loop.time())
+                    )
+                except TimeoutError:
+                    pass
+
+
+_job_waiter = _JobWaiter()
+
+
+async def _await_completion(job_id: str, poll_now: bool = True):
+    """Wait for a Text-To-CAD job to reach a terminal status.
 
     Args:
-        prompt (str): a description of the CAD model to be created
+        job_id (str): The id of the Text-To-CAD job to wait on.
+        poll_now (bool): Whether the job is likely finished, so the first poll should not be delayed.
 
     Returns:
-        A string containing the complete KCL code of the CAD model if Text-To-CAD was successful, otherwise an error
-        message from Text-To-CAD
+        The Text-To-CAD response once its status is completed or failed.
     """
+    return await _job_waiter.watch(job_id, poll_now=poll_now)
 
-    logger.info("Sending prompt to Text-To-CAD")
 
-    # send prompt via the kittycad client
-    t2c = kittycad_client.ml.create_text_to_cad(
-        output_format=FileExportFormat.STEP,
-        kcl=True,
-        body=TextToCadCreateBody(
-            prompt=prompt,
-        ),
-    )
+async def _poll_and_extract(
+    job_id: str,
+    option_cls: type,
+    output_type: type[_T],
+    cache_key: str,
+    null_message: str,
+) -> _T | str:
+    """Follow a Text-To-CAD job's reasoning, wait for it to finish and extract its output or error.
 
-    # get the response based on the request id
-    result = kittycad_client.ml.get_text_to_cad_part_for_user(id=t2c.id)
-
-    # check if the request has either completed or failed, otherwise sleep and try again
-    time_start = time.time()
-    ws_complete = False
-    while result.root.status not in [ApiCallStatus.COMPLETED, ApiCallStatus.FAILED]:
-        if (
-            result.root.status == ApiCallStatus.QUEUED
-            and (time.time() - time_start) % 5 == 0
-        ):
-            logger.info("Text-To-CAD queued...")
-        if result.root.status == ApiCallStatus.IN_PROGRESS:
-            logger.info("Text-To-CAD in progress...")
-            if not ws_complete:
-                ws_complete = log_websocket_message(t2c.id)
-        logger.info(
-            "Waiting for Text-To-CAD to complete... status %s", result.root.status
-        )
-        result = kittycad_client.ml.get_text_to_cad_part_for_user(id=t2c.id)
-        await asyncio.sleep(1)
+    Args:
+        job_id (str): The id of the Text-To-CAD job.
+        option_cls (type): The response variant the job is expected to return, a key of `_RESULT_ATTRS`.
+        output_type (type[_T]): The type of the output held by a completed `option_cls` response.
+        cache_key (str): The response cache key to store a successful output under.
+        null_message (str): The message returned when the response holds no output or error.
+
+    Returns:
+        _T | str: The output of the job if it completed, otherwise an error message.
+    """
+    reasoning_complete = await asyncio.to_thread(log_websocket_message, job_id)
+
+    # a job is never finished straight after submission, so unless its reasoning stream ran to the end there is
+    # no point polling before the first backoff delay
+    result = await _await_completion(job_id, poll_now=reasoning_complete)
 
     logger.info("Received response from Text-To-CAD")
 
@@ -166,18 +383,64 @@ async def text_to_cad(prompt: str) -> str:
     response = result.root
 
     # check the data type of the response
-    if not isinstance(response, OptionTextToCad):
-        return "Error: Text-to-CAD response is not of type OptionTextToCad."
-
-    # if Text To CAD was successful return the KCL code, otherwise return the error
-    if response.status == ApiCallStatus.COMPLETED:
-        if response.code is None:
-            return "Error: Text-to-CAD response is null."
-        return response.code
-    else:
-        if response.error is None:
-            return "Error: Text-to-CAD response is null."
-        return response.error
+    if not isinstance(response, option_cls):
+        return f"Error: Text-to-CAD response is not of type {option_cls.__name__}."
+
+    # if Text To CAD was successful return the output, otherwise return the error
+    completed = response.status == ApiCallStatus.COMPLETED
+    output = getattr(response, _RESULT_ATTRS[option_cls] if completed else "error")
+    if output is None:
+        return null_message
+    if not completed:
+        return str(output)
+    if not isinstance(output, output_type):
+        return f"Error: Text-to-CAD output is not of type {output_type.__name__}."
+    _cache_put(cache_key, output)
+    return output
+
+
+async def text_to_cad(prompt: str) -> str:
+    """Send a prompt to Zoo's Text-To-CAD create endpoint
+
+    Args:
+        prompt (str): a description of the CAD model to be created
+
+    Returns:
+        A string containing the complete KCL code of the CAD model if Text-To-CAD was successful, otherwise an error
+        message from Text-To-CAD
+    """
+
+    key = _cache_key("text_to_cad", prompt)
+    cached = _cache_get(key)
+    if isinstance(cached, str):
+        logger.info("Returning cached Text-To-CAD response")
+        return cached
+
+    async def submit() -> str:
+        logger.info("Sending prompt to Text-To-CAD")
+
+        # send prompt via the kittycad client
+        t2c = await call_with_retry(
+            get_kittycad_client().ml.create_text_to_cad,
+            idempotent=False,
+            output_format=FileExportFormat.STEP,
+            kcl=True,
+            body=TextToCadCreateBody(
+                prompt=prompt,
+            ),
+        )
+
+        # follow the request until it either completes or fails, then pull the KCL code out of the response
+        return await _poll_and_extract(
+            t2c.id,
+            OptionTextToCad,
+            str,
+            cache_key=key,
+            null_message="Error: Text-to-CAD response is null.",
+        )
+
+    # join an identical request that is already running rather than submitting it again
+    return await _run_once(key, submit)
 
 
 async def edit_kcl_project(
@@ -199,59 +462,66 @@ async def edit_kcl_project(
 
     logger.info("Finding all files in project path")
     proj_path = Path(proj_path)
-    file_paths = list(proj_path.rglob("*"))
-    file_paths = [fp for fp in file_paths if fp.is_file()]
+    # walk the project and check for main.kcl in worker threads at the same time, keeping the event loop free
+    (file_paths, rel_paths), has_main = await asyncio.gather(
+        asyncio.to_thread(_discover_files, proj_path),
+        asyncio.to_thread((proj_path / "main.kcl").is_file),
+    )
     logger.info("Found %s files in project path", len(file_paths))
 
     if not file_paths:
         logger.error("No files paths provided or found in project path")
         raise ZooMCPException("No file paths provided or found in project path")
 
-    if ".kcl" not in [fp.suffix for fp in file_paths]:
-        logger.error("No .kcl files found in the provided project path")
-        raise ZooMCPException("No .kcl files found in the provided project path")
-
-    if not (proj_path / "main.kcl").is_file():
+    # a root main.kcl already proves the project holds a .kcl file, so only scan the suffixes when it is missing
+    if not has_main:
+        if not any(fp.suffix == ".kcl" for fp in file_paths):
+            logger.error("No .kcl files found in the provided project path")
+            raise ZooMCPException("No .kcl files found in the provided project path")
         logger.error("No main.kcl file found in the root of the provided project path")
         raise ZooMCPException(
             "No main.kcl file found in the root of the provided project path"
         )
 
-    file_attachments: dict[str, SyncUpload] = {
-        str(fp.relative_to(proj_path)): str(fp.resolve()) for fp in file_paths
-    }
-
-    t2cmfi = kittycad_client.ml.create_text_to_cad_multi_file_iteration(
-        body=TextToCadMultiFileIterationBody(
-            source_ranges=[],
-            prompt=prompt,
-        ),
-        file_attachments=file_attachments,
+    # hash all the project files concurrently rather than one after another
+    semaphore = asyncio.Semaphore(_MAX_OPEN_FILES)
+    digests = await asyncio.gather(
+        *[_hash_attachment(fp, semaphore) for fp in file_paths]
     )
 
-    log_websocket_message(t2cmfi.id)
-
-    # get the response based on the request id
-    result = kittycad_client.ml.get_text_to_cad_part_for_user(id=t2cmfi.id)
-
-    # check if the request has either completed or failed, otherwise sleep and try again
-    while result.root.status not in [ApiCallStatus.COMPLETED, ApiCallStatus.FAILED]:
-        result = kittycad_client.ml.get_text_to_cad_part_for_user(id=t2cmfi.id)
-        await asyncio.sleep(1)
+    # key on the project contents so a repeated prompt on an unchanged project is served from the cache
+    key_parts: list[str | bytes] = ["edit_kcl_project", prompt]
+    for rel_path, digest in sorted(zip(rel_paths, digests)):
+        key_parts += [rel_path, digest]
+    key = _cache_key(*key_parts)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Returning cached Text-To-CAD edit kcl project response")
+        return cached
+
+    async def submit() -> dict | str:
+        # pass paths rather than file contents, the SDK opens each file as it builds the upload and streams it in
+        # chunks, so the project is never held in memory as a whole
+        file_attachments: dict[str, SyncUpload] = dict(zip(rel_paths, file_paths))
+
+        t2cmfi = await call_with_retry(
+            get_kittycad_client().ml.create_text_to_cad_multi_file_iteration,
+            idempotent=False,
+            body=TextToCadMultiFileIterationBody(
+                source_ranges=[],
+                prompt=prompt,
+            ),
+            file_attachments=file_attachments,
+        )
 
-    # get the data object (root) of the response
-    response = result.root
+        # follow the request until it either completes or fails, then pull the KCL files out of the response
+        return await _poll_and_extract(
+            t2cmfi.id,
+            OptionTextToCadMultiFileIteration,
+            dict,
+            cache_key=key,
+            null_message="Error: Text-to-CAD edit kcl project response is null.",
+        )
 
-    # check the data type of the response
-    if not isinstance(response, OptionTextToCadMultiFileIteration):
-        return "Error: Text-to-CAD response is not of type OptionTextToCadMultiFileIteration."
-
-    # if Text To CAD iteration was successful return the KCL code, otherwise return the error
-    if response.status == ApiCallStatus.COMPLETED:
-        if response.outputs is None:
-            return "Error: Text-to-CAD edit kcl project response is null."
-        return response.outputs
-    else:
-        if response.error is None:
-            return "Error: Text-to-CAD edit kcl project response is null."
-        return response.error
+    # join an identical request that is already running rather than submitting it again
+    return await _run_once(key, submit)
@@ -4,12 +4,12 @@ This module fetches KCL documentation from the modeling-app GitHub repository
 at server startup and provides search functionality for LLMs.
 """
 
-import asyncio
+import functools
+import heapq
 import re
+from collections import defaultdict
 from dataclasses import dataclass, field
-from posixpath import normpath
 from typing import ClassVar
-from urllib.parse import unquote
 
 import httpx
 
@@ -17,29 +17,47 @@ from zoo_mcp import logger
 from zoo_mcp.utils.data_retrieval_utils import (
     GITHUB_REPO,
     extract_excerpt,
-    fetch_github_file,
-    is_safe_path_component,
+    fetch_github_files,
+    fetch_github_tarball_files,
+    get_github_client,
+    load_cached_data,
     resolve_github_ref,
+    store_cached_data,
 )
 
-# Only allow safe characters in doc paths
-_SAFE_DOC_PATH_RE = re.compile(r"^docs/[A-Za-z0-9/_-]+\.md$")
+# Repository directory holding the docs
+_DOCS_DIR = "docs"
 
+# Only allow safe characters in doc paths. Path segments must be non-empty and "." is only allowed in the
+# extension, so neither traversal sequences nor percent-encoding can get through.
+_SAFE_DOC_PATH_RE = re.compile(r"docs/(?:[A-Za-z0-9_-]+/)*[A-Za-z0-9_-]+\.md", re.ASCII)
 
-def _is_safe_doc_path(path: str) -> bool:
-    """Validate that a doc path is safe and does not contain traversal sequences."""
-    if not is_safe_path_component(path, _SAFE_DOC_PATH_RE):
-        return False
+# Doc path prefixes (after the shared stem) for each index category
+_CATEGORY_STEM = "docs/kcl-"
+_CATEGORY_PREFIXES = {
+    "lang/": "kcl-lang",
+    "std/functions/": "kcl-std-functions",
+    "std/types/": "kcl-std-types",
+    "std/consts/": "kcl-std-consts",
+    "std/modules/": "kcl-std-modules",
+}
+
+# Number of distinct searches whose results are kept
+_SEARCH_CACHE_SIZE = 256
+
+# Terms indexed for search, matched against lowercased content
+_TOKEN_RE = re.compile(r"[a-z0-9_]+", re.ASCII)
+
+# First-level Markdown heading: "# " at the start of a line, ignoring whitespace around the line and the title
+_TITLE_RE = re.compile(r"^[^\S\n]*# [^\S\n]*(\S.*?)[^\S\n]*$", re.MULTILINE)
 
-    # Additional check: after normalization the path must still be under docs/
-    normalized = normpath(unquote(path))
-    if not normalized.startswith("docs/"):
-        return False
 
-    return True
+def _is_safe_doc_path(path: str) -> bool:
+    """Validate that a doc path is safe and does not contain traversal sequences."""
+    return _SAFE_DOC_PATH_RE.fullmatch(path) is not None
 
 
-@dataclass
+@dataclass(eq=False)
 class KCLDocs:
     """Container for documentation data."""
 
@@ -54,45 +72,87 @@ class KCLDocs:
         }
     )
 
+    docs_lower: dict[str, str] = field(default_factory=dict)
+    titles: dict[str, str] = field(default_factory=dict)
+    # term -> {path: number of times the term appears in the doc}
+    token_index: dict[str, dict[str, int]] = field(default_factory=dict)
+
     _instance: ClassVar["KCLDocs | None"] = None
 
+    def add(self, path: str, content: str) -> None:
+        """Add a doc to the cache and the search index."""
+        self.docs[path] = content
+        content_lower = content.lower()
+        self.docs_lower[path] = content_lower
+        self.titles[path] = _extract_title(content)
+        for term in _TOKEN_RE.findall(content_lower):
+            postings = self.token_index.setdefault(term, {})
+            postings[path] = postings.get(path, 0) + 1
+
     @classmethod
     def get(cls) -> "KCLDocs":
         """Get the cached docs instance, or empty cache if not initialized."""
-        return cls._instance if cls._instance is not None else cls()
+        return _DOCS
 
     @classmethod
     async def initialize(cls) -> None:
         """Initialize the docs cache from GitHub."""
+        global _DOCS
         if cls._instance is None:
             cls._instance = await _fetch_docs_from_github()
+            _DOCS = cls._instance
+
+
+# The loaded docs, read directly by the lookup functions. Empty until initialized.
+_DOCS = KCLDocs()
 
 
 def _categorize_doc_path(path: str) -> str | None:
     """Categorize a doc path into one of the index categories."""
-    if path.startswith("docs/kcl-lang/"):
-        return "kcl-lang"
-    elif path.startswith("docs/kcl-std/functions/"):
-        return "kcl-std-functions"
-    elif path.startswith("docs/kcl-std/types/"):
-        return "kcl-std-types"
-    elif path.startswith("docs/kcl-std/consts/"):
-        return "kcl-std-consts"
-    elif path.startswith("docs/kcl-std/modules/"):
-        return "kcl-std-modules"
-    elif path.startswith("docs/kcl-std/"):
-        # Other kcl-std files (index.md, README.md)
+    if not path.startswith(_CATEGORY_STEM):
         return None
+    rest = path[len(_CATEGORY_STEM) :]
+    for prefix, category in _CATEGORY_PREFIXES.items():
+        if rest.startswith(prefix):
+            return category
+    # Other kcl-std files (index.md, README.md)
     return None
 
 
 def _extract_title(content: str) -> str:
     """Extract the title from Markdown content (first # heading)."""
-    for line in content.split("\n"):
-        line = line.strip()
-        if line.startswith("# "):
-            return line[2:].strip()
-    return ""
+    match = _TITLE_RE.search(content)
+    return match.group(1) if match else ""
+
+
+async def _fetch_doc_files(client: httpx.AsyncClient, ref: str) -> dict[str, str]:
+    """Fetch the docs one file at a time, listing them through the GitHub tree API."""
+    # List only the docs/ subtree rather than the whole repository
+    tree_url = f"https://api.github.com/repos/{GITHUB_REPO}/git/trees/{ref}:{_DOCS_DIR}?recursive=1"
+    raw_content_base = f"https://raw.githubusercontent.com/{GITHUB_REPO}/{ref}/"
+
+    # Get file tree from GitHub API
+    try:
+        response = await client.get(tree_url)
+        response.raise_for_status()
+        tree_data = response.json()
+    except httpx.HTTPError as e:
+        logger.warning(f"Failed to fetch GitHub tree: {e}")
+        return {}
+
+    # Filter for docs/*.md files
+    doc_paths: list[str] = []
+    for item in tree_data.get("tree", []):
+        path = f"{_DOCS_DIR}/{item.get('path', '')}"
+        if item.get("type") == "blob" and _is_safe_doc_path(path):
+            doc_paths.append(path)
+
+    logger.info(f"Found {len(doc_paths)} documentation files")
+
+    # Fetch raw content in parallel
+    return await fetch_github_files(
+        client, {path: f"{raw_content_base}{path}" for path in doc_paths}
+    )
 
 
 async def _fetch_docs_from_github() -> KCLDocs:
@@ -104,49 +164,35 @@ async def _fetch_docs_from_github() -> KCLDocs:
 
     logger.info("Fetching KCL documentation from GitHub...")
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # 1. Resolve the latest release tag (fall back to "main" if unavailable)
-        ref = await resolve_github_ref(client)
-
-        tree_url = (
-            f"https://api.github.com/repos/{GITHUB_REPO}/git/trees/{ref}?recursive=1"
-        )
-        raw_content_base = f"https://raw.githubusercontent.com/{GITHUB_REPO}/{ref}/"
-
-        # 2. Get file tree from GitHub API
-        try:
-            response = await client.get(tree_url)
-            response.raise_for_status()
-            tree_data = response.json()
-        except httpx.HTTPError as e:
-            logger.warning(f"Failed to fetch GitHub tree: {e}")
-            return docs
-
-        # 3. Filter for docs/*.md files
-        doc_paths: list[str] = []
-        for item in tree_data.get("tree", []):
-            path = item.get("path", "")
-            if item.get("type") == "blob" and _is_safe_doc_path(path):
-                doc_paths.append(path)
-
-        logger.info(f"Found {len(doc_paths)} documentation files")
-
-        # 4. Fetch raw content in parallel
-        tasks = [
-            fetch_github_file(client, f"{raw_content_base}{path}", path)
-            for path in doc_paths
-        ]
-        results = await asyncio.gather(*tasks)
-
-        # 5. Populate cache and index
-        for path, content in zip(doc_paths, results):
-            if content is not None:
-                docs.docs[path] = content
-
-                # Categorize the doc
-                category = _categorize_doc_path(path)
-                if category and category in docs.index:
-                    docs.index[category].append(path)
+    client = get_github_client()
+    # 1. Resolve the latest release tag (fall back to "main" if unavailable)
+    ref = await resolve_github_ref(client)
+
+    # 2. Reuse the docs saved by an earlier startup for the same release
+    cached = await load_cached_data("docs", ref)
+    if isinstance(cached, dict):
+        contents = {
+            path: content
+            for path, content in cached.items()
+            if isinstance(content, str) and _is_safe_doc_path(path)
+        }
+    else:
+        # Pull every doc out of a single tarball of the release, falling back to one request per file
+        contents = await fetch_github_tarball_files(client, ref, _is_safe_doc_path)
+        if contents is not None:
+            await store_cached_data("docs", ref, contents)
+        else:
+            logger.info("Falling back to fetching documentation file by file")
+            contents = await _fetch_doc_files(client, ref)
+
+    # 3. Populate cache and index
+    for path in sorted(contents):
+        docs.add(path, contents[path])
+
+        # Categorize the doc
+        category = _categorize_doc_path(path)
+        if category and category in docs.index:
+            docs.index[category].append(path)
 
     # Sort the index lists
     for category in docs.index:
@@ -177,7 +223,78 @@ def list_available_docs() -> dict[str, list[str]]:
     Returns:
         dict: Categories mapped to lists of available documentation paths.
     """
-    return KCLDocs.get().index
+    return _DOCS.index
+
+
+def _count_matches(kcl_docs: KCLDocs, query_lower: str) -> dict[str, int]:
+    """Count the occurrences of a lowercased query in each doc, using the term index.
+
+    A query made up of a single run of word characters can only occur inside one indexed term, so its count in a
+    doc is the sum of its count in each term containing it, weighted by how often that term appears in the doc.
+    This gives the same counts as a substring search of every doc while only scanning the term vocabulary.
+
+    Any other query is counted with a substring search, limited to the docs whose terms can contain each of its
+    word runs.
+    """
+    counts: defaultdict[str, int] = defaultdict(int)
+    if _TOKEN_RE.fullmatch(query_lower):
+        for term, postings in kcl_docs.token_index.items():
+            if query_lower in term:
+                occurrences = term.count(query_lower)
+                for path, term_count in postings.items():
+                    counts[path] += occurrences * term_count
+        return counts
+
+    candidates: set[str] | None = None
+    for token in _TOKEN_RE.findall(query_lower):
+        token_paths = {
+            path
+            for term, postings in kcl_docs.token_index.items()
+            if token in term
+            for path in postings
+        }
+        candidates = token_paths if candidates is None else candidates & token_paths
+    if candidates is None:
+        # no word characters to narrow the search with
+        candidates = set(kcl_docs.docs_lower)
+
+    for path in candidates:
+        match_count = kcl_docs.docs_lower[path].count(query_lower)
+        if match_count > 0:
+            counts[path] = match_count
+    return counts
+
+
+@functools.lru_cache(maxsize=_SEARCH_CACHE_SIZE)
+def _search_docs_cached(
+    kcl_docs: KCLDocs, query_lower: str, max_results: int
+) -> tuple[dict, ...]:
+    """Search the docs for a lowercased query.
+
+    Docs are not modified once loaded and KCLDocs hashes by identity, so results are cached per instance.
+    """
+    match_counts = _count_matches(kcl_docs, query_lower)
+
+    # Pick the top docs by match count (ties keep doc order) before building excerpts
+    top_paths = heapq.nlargest(
+        max_results,
+        (path for path in kcl_docs.docs if path in match_counts),
+        key=match_counts.__getitem__,
+    )
+
+    return tuple(
+        {
+            "path": path,
+            "title": kcl_docs.titles[path],
+            "excerpt": extract_excerpt(
+                kcl_docs.docs[path],
+                query_lower,
+                content_lower=kcl_docs.docs_lower[path],
+            ),
+            "match_count": match_counts[path],
+        }
+        for path in top_paths
+    )
 
 
 def search_docs(query: str, max_results: int = 5) -> list[dict]:
@@ -201,32 +318,8 @@ def search_docs(query: str, max_results: int = 5) -> list[dict]:
     if not query or not query.strip():
         return [{"error": "Empty search query"}]
 
-    query = query.strip()
-    query_lower = query.lower()
-    results: list[dict] = []
-
-    for path, content in KCLDocs.get().docs.items():
-        content_lower = content.lower()
-
-        # Count matches
-        match_count = content_lower.count(query_lower)
-        if match_count > 0:
-            title = _extract_title(content)
-            excerpt = extract_excerpt(content, query)
-
-            results.append(
-                {
-                    "path": path,
-                    "title": title,
-                    "excerpt": excerpt,
-                    "match_count": match_count,
-                }
-            )
-
-    # Sort by match count (descending)
-    results.sort(key=lambda x: x["match_count"], reverse=True)
-
-    return results[:max_results]
+    hits = _search_docs_cached(_DOCS, query.strip().lower(), max_results)
+    return [dict(hit) for hit in hits]
 
 
 def get_doc_content(doc_path: str) -> str | None:
@@ -247,4 +340,4 @@ def get_doc_content(doc_path: str) -> str | None:
     if not _is_safe_doc_path(doc_path):
         return None
 
-    return KCLDocs.get().docs.get(doc_path)
+    return _DOCS.docs.get(doc_path)
@@ -4,10 +4,12 @@ This module fetches KCL samples from the modeling-app GitHub repository
 at server startup and provides search functionality for LLMs.
 """
 
-import asyncio
+import functools
+import heapq
 import re
 from dataclasses import dataclass, field
-from typing import ClassVar, TypedDict
+from operator import itemgetter
+from typing import ClassVar, NamedTuple, TypedDict
 
 import httpx
 
@@ -15,16 +17,22 @@ from zoo_mcp import logger
 from zoo_mcp.utils.data_retrieval_utils import (
     GITHUB_REPO,
     extract_excerpt,
-    fetch_github_file,
-    is_safe_path_component,
+    fetch_github_files,
+    get_github_client,
+    load_cached_data,
     resolve_github_ref,
+    store_cached_data,
 )
 
 _SAMPLES_PATH = "public/kcl-samples"
 
-# Only allow safe characters in sample names and filenames
-_SAFE_NAME_RE = re.compile(r"^[A-Za-z0-9_-]+$")
-_SAFE_FILENAME_RE = re.compile(r"^[A-Za-z0-9_-]+\.kcl$")
+# Number of distinct searches whose results are kept
+_SEARCH_CACHE_SIZE = 256
+
+# Only allow safe characters in sample names and filenames. Neither allows "/" or "%", and "." only appears in
+# the .kcl extension, so a full match rules out traversal and encoded sequences.
+_SAFE_NAME_RE = re.compile(r"[A-Za-z0-9_-]+", re.ASCII)
+_SAFE_FILENAME_RE = re.compile(r"[A-Za-z0-9_-]+\.kcl", re.ASCII)
 
 
 class SampleMetadata(TypedDict):
@@ -55,7 +63,19 @@ class SampleData(TypedDict):
     files: list[SampleFile]
 
 
-@dataclass
+class SampleSearchRow(NamedTuple):
+    """The search fields of a sample, precomputed when the manifest is loaded."""
+
+    name: str
+    title: str
+    description: str
+    multiple_files: bool
+    searchable: str
+    searchable_lower: str
+    title_lower: str
+
+
+@dataclass(eq=False)
 class KCLSamples:
     """Container for KCL samples data."""
 
@@ -63,21 +83,45 @@ class KCLSamples:
     manifest: dict[str, SampleMetadata] = field(default_factory=dict)
     # Cached file contents: sample_name -> filename -> content
     file_cache: dict[str, dict[str, str]] = field(default_factory=dict)
+    # Search fields indexed by sample directory name
+    search_rows: dict[str, SampleSearchRow] = field(default_factory=dict)
     # Git ref (release tag) used to fetch content
     _ref: str = "main"
 
     _instance: ClassVar["KCLSamples | None"] = None
 
+    def add(self, name: str, metadata: SampleMetadata) -> None:
+        """Add a sample's manifest entry and its search fields."""
+        self.manifest[name] = metadata
+        title = metadata.get("title", name)
+        description = metadata.get("description", "")
+        searchable = f"{title} {description} {name}"
+        self.search_rows[name] = SampleSearchRow(
+            name=name,
+            title=title,
+            description=description,
+            multiple_files=metadata.get("multipleFiles", False),
+            searchable=searchable,
+            searchable_lower=searchable.lower(),
+            title_lower=title.lower(),
+        )
+
     @classmethod
     def get(cls) -> "KCLSamples":
         """Get the cached samples instance, or empty cache if not initialized."""
-        return cls._instance if cls._instance is not None else cls()
+        return _SAMPLES
 
     @classmethod
     async def initialize(cls) -> None:
         """Initialize the samples cache from GitHub."""
+        global _SAMPLES
         if cls._instance is None:
             cls._instance = await _fetch_manifest_from_github()
+            _SAMPLES = cls._instance
+
+
+# The loaded samples, read directly by the lookup functions. Empty until initialized.
+_SAMPLES = KCLSamples()
 
 
 def _extract_sample_name(path: str) -> str:
@@ -88,27 +132,36 @@ def _extract_sample_name(path: str) -> str:
     return path.split("/")[0] if "/" in path else path
 
 
+def _validated_filenames(sample_name: str, metadata: SampleMetadata) -> list[str]:
+    """Return the sample's filenames from the manifest, dropping unsafe ones."""
+    filenames = []
+    for f in metadata.get("files", ["main.kcl"]):
+        if _SAFE_FILENAME_RE.fullmatch(f):
+            filenames.append(f)
+        else:
+            logger.warning(f"Rejected unsafe filename in sample {sample_name!r}: {f!r}")
+    return filenames
+
+
 async def _fetch_sample_files(
     client: httpx.AsyncClient,
     raw_content_base: str,
-    sample_name: str,
-    filenames: list[str],
-) -> dict[str, str]:
-    """Fetch all files for a sample."""
-    tasks = [
-        fetch_github_file(
-            client,
-            f"{raw_content_base}{sample_name}/{filename}",
-            f"{sample_name}/{filename}",
-        )
-        for filename in filenames
-    ]
-    results = await asyncio.gather(*tasks)
-    return {
-        filename: content
-        for filename, content in zip(filenames, results)
-        if content is not None
-    }
+    sample_files: dict[str, list[str]],
+) -> dict[str, dict[str, str]]:
+    """Fetch the files of one or more samples, mapping each sample name to its fetched files."""
+    fetched = await fetch_github_files(
+        client,
+        {
+            f"{sample_name}/{filename}": f"{raw_content_base}{sample_name}/{filename}"
+            for sample_name, filenames in sample_files.items()
+            for filename in filenames
+        },
+    )
+    file_contents: dict[str, dict[str, str]] = {}
+    for label, content in fetched.items():
+        sample_name, filename = label.split("/", 1)
+        file_contents.setdefault(sample_name, {})[filename] = content
+    return file_contents
 
 
 async def _fetch_manifest_from_github() -> KCLSamples:
@@ -117,39 +170,87 @@ async def _fetch_manifest_from_github() -> KCLSamples:
 
     logger.info("Fetching KCL samples manifest from GitHub...")
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # 1. Resolve the latest release tag (fall back to "main" if unavailable)
-        ref = await resolve_github_ref(client)
-
-        raw_content_base = (
-            f"https://raw.githubusercontent.com/{GITHUB_REPO}/{ref}/{_SAMPLES_PATH}/"
-        )
-        manifest_url = f"{raw_content_base}manifest.json"
-
-        # Store ref for later use when fetching sample files on-demand
-        samples._ref = ref
+    client = get_github_client()
+    # 1. Resolve the latest release tag (fall back to "main" if unavailable)
+    ref = await resolve_github_ref(client)
 
+    raw_content_base = (
+        f"https://raw.githubusercontent.com/{GITHUB_REPO}/{ref}/{_SAMPLES_PATH}/"
+    )
+    manifest_url = f"{raw_content_base}manifest.json"
+
+    # Store ref for later use when fetching sample files on-demand
+    samples._ref = ref
+
+    # Reuse the manifest and files saved by an earlier startup for the same release
+    cached = await load_cached_data("samples", ref)
+    cached_files: dict[str, dict[str, str]] | None = None
+    if (
+        isinstance(cached, dict)
+        and isinstance(cached.get("manifest"), list)
+        and isinstance(cached.get("files"), dict)
+    ):
+        manifest_data: list[SampleMetadata] = cached["manifest"]
+        cached_files = cached["files"]
+    else:
         try:
             response = await client.get(manifest_url)
             response.raise_for_status()
-            manifest_data: list[SampleMetadata] = response.json()
+            manifest_data = response.json()
         except httpx.HTTPError as e:
             logger.warning(f"Failed to fetch samples manifest: {e}")
             return samples
 
-        # Index manifest by sample name, validating each name
-        for entry in manifest_data:
-            sample_name = _extract_sample_name(
-                entry.get("pathFromProjectDirectoryToFirstFile", "")
+    # Index manifest by sample name, validating each name
+    for entry in manifest_data:
+        sample_name = _extract_sample_name(
+            entry.get("pathFromProjectDirectoryToFirstFile", "")
+        )
+        if sample_name and _SAFE_NAME_RE.fullmatch(sample_name):
+            samples.add(sample_name, entry)
+        elif sample_name:
+            logger.warning(
+                f"Rejected unsafe sample name from manifest: {sample_name!r}"
+            )
+
+    if cached_files is not None:
+        for name in samples.manifest:
+            files = cached_files.get(name)
+            if isinstance(files, dict):
+                samples.file_cache[name] = {
+                    filename: content
+                    for filename, content in files.items()
+                    if isinstance(content, str)
+                    and _SAFE_FILENAME_RE.fullmatch(filename)
+                }
+    else:
+        # Prefetch every sample's files so get_sample_content is a cache lookup.
+        # Samples with any file that fails to download are left uncached and retried on demand.
+        sample_files = {
+            name: _validated_filenames(name, metadata)
+            for name, metadata in samples.manifest.items()
+        }
+        fetched = await _fetch_sample_files(client, raw_content_base, sample_files)
+        complete = {
+            name: files
+            for name, files in fetched.items()
+            if len(files) == len(sample_files[name])
+        }
+        samples.file_cache.update(complete)
+
+        # Only save complete downloads, so a failed file is not missing on every later startup
+        if all(
+            len(complete.get(name, {})) == len(filenames)
+            for name, filenames in sample_files.items()
+        ):
+            await store_cached_data(
+                "samples", ref, {"manifest": manifest_data, "files": complete}
             )
-            if sample_name and is_safe_path_component(sample_name, _SAFE_NAME_RE):
-                samples.manifest[sample_name] = entry
-            elif sample_name:
-                logger.warning(
-                    f"Rejected unsafe sample name from manifest: {sample_name!r}"
-                )
-
-    logger.info(f"KCL samples manifest loaded with {len(samples.manifest)} samples")
+
+    logger.info(
+        f"KCL samples manifest loaded with {len(samples.manifest)} samples "
+        f"({len(samples.file_cache)} prefetched)"
+    )
     return samples
 
 
@@ -172,7 +273,7 @@ def list_available_samples() -> list[dict]:
     Returns:
         list[dict]: List of sample information dictionaries.
     """
-    samples = KCLSamples.get()
+    samples = _SAMPLES
     result = []
 
     for name, metadata in sorted(samples.manifest.items()):
@@ -188,6 +289,45 @@ def list_available_samples() -> list[dict]:
     return result
 
 
+@functools.lru_cache(maxsize=_SEARCH_CACHE_SIZE)
+def _search_samples_cached(
+    samples: KCLSamples, query_lower: str, max_results: int
+) -> tuple[dict, ...]:
+    """Search the samples for a lowercased query.
+
+    The search fields are not modified once the manifest is loaded and KCLSamples hashes by identity, so results
+    are cached per instance.
+    """
+    scored: list[tuple[int, int, SampleSearchRow]] = []
+    for row in samples.search_rows.values():
+        match_count = row.searchable_lower.count(query_lower)
+        if match_count > 0:
+            # Prioritize samples whose title contains the query
+            title_hit = query_lower in row.title_lower
+            score = match_count + (3 if title_hit else 0)  # Boost title matches
+            scored.append((score, match_count, row))
+
+    # Pick the top samples by score (ties keep manifest order) before building excerpts
+    return tuple(
+        {
+            "name": row.name,
+            "title": row.title,
+            "description": row.description,
+            "multipleFiles": row.multiple_files,
+            "match_count": match_count,
+            "excerpt": extract_excerpt(
+                row.searchable,
+                query_lower,
+                context_chars=150,
+                content_lower=row.searchable_lower,
+            ),
+        }
+        for _, match_count, row in heapq.nlargest(
+            max_results, scored, key=itemgetter(0)
+        )
+    )
+
+
 def search_samples(query: str, max_results: int = 5) -> list[dict]:
     """Search samples by keyword in title and description.
 
@@ -210,46 +350,8 @@ def search_samples(query: str, max_results: int = 5) -> list[dict]:
     if not query or not query.strip():
         return [{"error": "Empty search query"}]
 
-    query = query.strip()
-    query_lower = query.lower()
-    results: list[dict] = []
-
-    samples = KCLSamples.get()
-
-    for name, metadata in samples.manifest.items():
-        title = metadata.get("title", name)
-        description = metadata.get("description", "")
-        searchable = f"{title} {description} {name}"
-        searchable_lower = searchable.lower()
-
-        match_count = searchable_lower.count(query_lower)
-        if match_count > 0:
-            # Prioritize title matches
-            title_matches = title.lower().count(query_lower)
-            score = match_count + (title_matches * 3)  # Boost title matches
-
-            excerpt = extract_excerpt(searchable, query, context_chars=150)
-
-            results.append(
-                {
-                    "name": name,
-                    "title": title,
-                    "description": description,
-                    "multipleFiles": metadata.get("multipleFiles", False),
-                    "match_count": match_count,
-                    "excerpt": excerpt,
-                    "_score": score,
-                }
-            )
-
-    # Sort by score (descending)
-    results.sort(key=lambda x: x["_score"], reverse=True)
-
-    # Remove internal score field
-    for r in results:
-        del r["_score"]
-
-    return results[:max_results]
+    hits = _search_samples_cached(_SAMPLES, query.strip().lower(), max_results)
+    return [dict(hit) for hit in hits]
 
 
 async def get_sample_content(sample_name: str) -> SampleData | None:
@@ -271,43 +373,36 @@ async def get_sample_content(sample_name: str) -> SampleData | None:
             - files: List of file dictionaries, each with 'filename' and 'content'
         Returns None if the sample is not found.
     """
-    samples = KCLSamples.get()
+    samples = _SAMPLES
 
     # Validate sample name against allowlist
-    if not is_safe_path_component(sample_name, _SAFE_NAME_RE):
+    if not _SAFE_NAME_RE.fullmatch(sample_name):
         return None
 
     metadata = samples.manifest.get(sample_name)
     if metadata is None:
         return None
 
-    # Check if we have cached files
+    # Files are prefetched at startup; fetch on demand if that failed
     if sample_name in samples.file_cache:
         file_contents = samples.file_cache[sample_name]
     else:
         # Validate and filter filenames from manifest
-        raw_filenames = metadata.get("files", ["main.kcl"])
-        filenames = []
-        for f in raw_filenames:
-            if is_safe_path_component(f, _SAFE_FILENAME_RE):
-                filenames.append(f)
-            else:
-                logger.warning(
-                    f"Rejected unsafe filename in sample {sample_name!r}: {f!r}"
-                )
-
+        filenames = _validated_filenames(sample_name, metadata)
         if not filenames:
             return None
 
         raw_content_base = f"https://raw.githubusercontent.com/{GITHUB_REPO}/{samples._ref}/{_SAMPLES_PATH}/"
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            file_contents = await _fetch_sample_files(
-                client, raw_content_base, sample_name, filenames
-            )
+        client = get_github_client()
+        fetched = await _fetch_sample_files(
+            client, raw_content_base, {sample_name: filenames}
+        )
+        file_contents = fetched.get(sample_name, {})
 
-        # Cache the results
-        samples.file_cache[sample_name] = file_contents
+        # Cache the files only once all of them are in, so a failed file is fetched again next time
+        if len(file_contents) == len(filenames):
+            samples.file_cache[sample_name] = file_contents
 
     # Build response
     files_list: list[SampleFile] = []
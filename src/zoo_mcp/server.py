@@ -1,11 +1,18 @@
+import asyncio
+import hashlib
+import importlib.util
+from collections import OrderedDict
+
+import anyio
 import kcl
 from kittycad.models.modeling_cmd import OptionDefaultCameraLookAt, Point3d
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ImageContent
 
-from zoo_mcp import ZooMCPException, logger
+from zoo_mcp import ZooMCPException, close_api_executor, logger
 from zoo_mcp.ai_tools import edit_kcl_project as _edit_kcl_project
 from zoo_mcp.ai_tools import text_to_cad as _text_to_cad
+from zoo_mcp.utils.data_retrieval_utils import close_github_client
 from zoo_mcp.utils.image_utils import encode_image, save_image_to_disk
 from zoo_mcp.zoo_tools import (
     CameraView,
@@ -37,6 +44,10 @@ mcp = FastMCP(
     log_level="INFO",
 )
 
+# Encoded multiview snapshots of inline KCL code, keyed by (code digest, zoom), least recently used first
+_MULTIVIEW_CACHE_SIZE = 32
+_multiview_cache: OrderedDict[tuple[bytes, bool], ImageContent] = OrderedDict()
+
 
 @mcp.tool()
 async def calculate_center_of_mass(input_file: str, unit_length: str) -> dict | str:
@@ -352,7 +363,7 @@ async def export_kcl(
         str: The path to the converted CAD file, or an error message if the operation fails.
     """
 
-    logger.info("convert_kcl_to_step tool called")
+    logger.info("export_kcl tool called")
 
     try:
         cad_path = await zoo_export_kcl(
@@ -498,7 +509,8 @@ async def multiview_snapshot_of_cad(
     logger.info("multiview_snapshot_of_cad tool called for file: %s", input_file)
 
     try:
-        image = zoo_multiview_snapshot_of_cad(
+        image = await asyncio.to_thread(
+            zoo_multiview_snapshot_of_cad,
             input_path=input_file,
             zoom=zoom,
         )
@@ -532,16 +544,30 @@ async def multiview_snapshot_of_kcl(
 
     logger.info("multiview_snapshot_of_kcl tool called")
 
+    # Snapshots of inline code only depend on the code, so repeated renders are served from the cache
+    key = None
+    if kcl_code:
+        key = (hashlib.blake2b(kcl_code.encode(), digest_size=16).digest(), zoom)
+        if key in _multiview_cache:
+            _multiview_cache.move_to_end(key)
+            return _multiview_cache[key]
+
     try:
         image = await zoo_multiview_snapshot_of_kcl(
             kcl_code=kcl_code,
             kcl_path=kcl_path,
             zoom=zoom,
         )
-        return encode_image(image)
+        content = encode_image(image)
     except Exception as e:
         return f"There was an error creating the multiview snapshot: {e}"
 
+    if key is not None:
+        _multiview_cache[key] = content
+        while len(_multiview_cache) > _MULTIVIEW_CACHE_SIZE:
+            _multiview_cache.popitem(last=False)
+    return content
+
 
 @mcp.tool()
 async def multi_isometric_snapshot_of_cad(
@@ -567,7 +593,8 @@ async def multi_isometric_snapshot_of_cad(
     logger.info("multi_isometric_snapshot_of_cad tool called for file: %s", input_file)
 
     try:
-        image = zoo_multi_isometric_snapshot_of_cad(
+        image = await asyncio.to_thread(
+            zoo_multi_isometric_snapshot_of_cad,
             input_path=input_file,
             zoom=zoom,
         )
@@ -764,7 +791,9 @@ async def text_to_cad(prompt: str) -> str:
     Returns:
         str: The generated KCL code if Text-to-CAD is successful, otherwise the error message.
     """
-    logger.info("text_to_cad tool called with prompt: %s", prompt)
+    logger.info(
+        "text_to_cad tool called with prompt (%d chars): %.80s", len(prompt), prompt
+    )
     try:
         return await _text_to_cad(prompt=prompt)
     except Exception as e:
@@ -803,7 +832,11 @@ async def edit_kcl_project(
                     If unsuccessful, returns an error message from Text-To-CAD.
     """
 
-    logger.info("edit_kcl_project tool called with prompt: %s", prompt)
+    logger.info(
+        "edit_kcl_project tool called with prompt (%d chars): %.80s",
+        len(prompt),
+        prompt,
+    )
 
     try:
         return await _edit_kcl_project(
@@ -832,15 +865,32 @@ async def save_image(
     logger.info("save_image tool called with output_path: %s", output_path)
 
     try:
-        saved_path = save_image_to_disk(image=image, output_path=output_path)
+        saved_path = await asyncio.to_thread(
+            save_image_to_disk, image=image, output_path=output_path
+        )
         return saved_path
     except Exception as e:
         return f"There was an error saving the image: {e}"
 
 
+async def _serve_stdio() -> None:
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        # close the pooled GitHub connections on the loop they were opened on
+        await close_github_client()
+        close_api_executor()
+
+
+def run_stdio() -> None:
+    """Serve over stdio, running on uvloop when it is installed (the "uvloop" extra)."""
+    use_uvloop = importlib.util.find_spec("uvloop") is not None
+    anyio.run(_serve_stdio, backend_options={"use_uvloop": use_uvloop})
+
+
 def main():
     logger.info("Starting MCP server...")
-    mcp.run(transport="stdio")
+    run_stdio()
 
 
 if __name__ == "__main__":
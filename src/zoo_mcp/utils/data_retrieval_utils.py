@@ -4,9 +4,16 @@ Provides common constants, path validation, content fetching, and text
 extraction helpers used by both kcl_docs and kcl_samples modules.
 """
 
-import posixpath
+import asyncio
+import json
+import os
 import re
-from urllib.parse import unquote
+import tarfile
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any
 
 import httpx
 
@@ -15,42 +22,171 @@ from zoo_mcp import logger
 GITHUB_REPO = "KittyCAD/modeling-app"
 _LATEST_RELEASE_URL = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
 
+# Maximum number of GitHub file fetches in flight at once
+MAX_CONCURRENT_FETCHES = 64
+# Connection pool limits for clients fetching from GitHub. Every connection used by a
+# full fan-out of fetches is kept alive, so the next batch does not reconnect.
+GITHUB_HTTP_LIMITS = httpx.Limits(
+    max_connections=MAX_CONCURRENT_FETCHES,
+    max_keepalive_connections=MAX_CONCURRENT_FETCHES,
+    keepalive_expiry=30.0,
+)
+# Retries for rate-limited (429) or server error (5xx) responses
+_MAX_FETCH_RETRIES = 3
+_MAX_RETRY_AFTER = 60.0
+# Client shared by all GitHub fetches, along with the event loop it was created on
+_github_client: httpx.AsyncClient | None = None
+_github_client_loop: asyncio.AbstractEventLoop | None = None
 
-def is_safe_path_component(value: str, pattern: re.Pattern[str]) -> bool:
-    """Validate that a path component is safe"""
-    if not value:
-        return False
+# GitHub file downloads in flight, keyed by URL, so concurrent requests for a file share one download
+_inflight_fetches: dict[str, asyncio.Task] = {}
 
-    # regex on raw value
-    if not pattern.match(value):
-        return False
+# How long a resolved release tag is used before GitHub is asked again, in seconds
+_RELEASE_TAG_TTL = 300.0
+# Last resolved release tag, with its ETag and the time.monotonic() it was resolved at
+_release_tag: tuple[str, str | None, float] | None = None
+# Release lookup in flight, shared by concurrent callers on the same event loop
+_release_tag_task: asyncio.Task | None = None
 
-    # decode and re-validate
-    decoded = unquote(value)
-    if not pattern.match(decoded):
-        return False
+# Release tags that can be used in a disk cache filename
+_CACHEABLE_REF_RE = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9._-]*", re.ASCII)
 
-    # normalize and verify no directory traversal
-    normalized = posixpath.normpath(decoded)
-    if normalized != decoded or normalized.startswith(".."):
-        return False
+# Characters that end a word when widening an excerpt to word boundaries
+_EXCERPT_WHITESPACE = (" ", "\n", "\t")
 
-    return True
+# Tarballs are buffered in memory up to this size before spilling to a temporary file
+_TARBALL_SPOOL_SIZE = 32 * 1024 * 1024
+# Downloaded chunks are collected up to this size before being written to the spool in a worker thread
+_TARBALL_WRITE_SIZE = 1024 * 1024
 
 
-async def resolve_latest_release_tag(client: httpx.AsyncClient) -> str | None:
-    """Resolve the latest release tag from the GitHub API."""
+def get_github_client() -> httpx.AsyncClient:
+    """Return the shared client for GitHub fetches.
+
+    Reusing one client keeps connections to GitHub alive between fetches. The
+    client's connections belong to the event loop they were opened on, so a
+    new client is created if it is requested from a different loop.
+    """
+    global _github_client, _github_client_loop
+    loop = asyncio.get_running_loop()
+    if (
+        _github_client is None
+        or _github_client.is_closed
+        or _github_client_loop is not loop
+    ):
+        _github_client = httpx.AsyncClient(timeout=30.0, limits=GITHUB_HTTP_LIMITS)
+        _github_client_loop = loop
+    return _github_client
+
+
+async def close_github_client() -> None:
+    """Close the shared GitHub client, if it was created."""
+    global _github_client, _github_client_loop
+    if _github_client is not None:
+        await _github_client.aclose()
+    _github_client = None
+    _github_client_loop = None
+
+
+def _disk_cache_path(name: str, ref: str) -> Path | None:
+    """Return the disk cache file for data fetched at ref, or None if it should not be cached.
+
+    Only release tags are cached, since their content never changes; the "main" fallback is always fetched.
+    The cache lives in $ZOO_MCP_CACHE_DIR, defaulting to zoo-mcp under the user's cache directory.
+    """
+    if ref == "main" or not _CACHEABLE_REF_RE.fullmatch(ref):
+        return None
+    cache_dir = os.environ.get("ZOO_MCP_CACHE_DIR")
+    if not cache_dir:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        cache_dir = Path(base) / "zoo-mcp"
+    return Path(cache_dir) / f"{name}-{ref}.json"
+
+
+def _read_disk_cache(path: Path) -> Any | None:
+    """Read a disk cache file, or return None if it is missing or unreadable."""
+    try:
+        with path.open(encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+        return None
+
+
+def _write_disk_cache(path: Path, data: Any) -> None:
+    """Write a disk cache file atomically, logging rather than raising on failure."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Failed to write cache file {path}: {e}")
+
+
+async def load_cached_data(name: str, ref: str) -> Any | None:
+    """Load data previously stored for ref with store_cached_data, or None if there is none."""
+    path = _disk_cache_path(name, ref)
+    if path is None:
+        return None
+    data = await asyncio.to_thread(_read_disk_cache, path)
+    if data is not None:
+        logger.info(f"Loaded {name} for {ref} from {path}")
+    return data
+
+
+async def store_cached_data(name: str, ref: str, data: Any) -> None:
+    """Store JSON-serializable data fetched at ref so later startups can skip fetching it."""
+    path = _disk_cache_path(name, ref)
+    if path is not None:
+        await asyncio.to_thread(_write_disk_cache, path, data)
+
+
+async def _fetch_latest_release_tag(client: httpx.AsyncClient) -> str | None:
+    """Fetch the latest release tag, revalidating the previous one with its ETag."""
+    global _release_tag
+    headers = {}
+    if _release_tag is not None and _release_tag[1]:
+        headers["If-None-Match"] = _release_tag[1]
     try:
-        response = await client.get(_LATEST_RELEASE_URL)
-        response.raise_for_status()
-        tag = response.json().get("tag_name")
+        response = await client.get(_LATEST_RELEASE_URL, headers=headers)
+        if response.status_code == 304 and _release_tag is not None:
+            tag, etag = _release_tag[0], response.headers.get("etag", _release_tag[1])
+        else:
+            response.raise_for_status()
+            tag, etag = response.json().get("tag_name"), response.headers.get("etag")
         if tag and isinstance(tag, str):
+            _release_tag = (tag, etag, time.monotonic())
             return tag
     except httpx.HTTPError as e:
         logger.warning(f"Failed to fetch latest release tag: {e}")
     return None
 
 
+async def resolve_latest_release_tag(client: httpx.AsyncClient) -> str | None:
+    """Resolve the latest release tag from the GitHub API.
+
+    A resolved tag is reused for a few minutes, and concurrent callers share one
+    lookup, so loading the docs and samples together asks GitHub once.
+    """
+    global _release_tag_task
+    if (
+        _release_tag is not None
+        and time.monotonic() - _release_tag[2] < _RELEASE_TAG_TTL
+    ):
+        return _release_tag[0]
+
+    task = _release_tag_task
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.create_task(_fetch_latest_release_tag(client))
+        _release_tag_task = task
+    # shield the shared lookup so one caller being cancelled does not cancel it for the others
+    return await asyncio.shield(task)
+
+
 async def resolve_github_ref(client: httpx.AsyncClient) -> str:
     """Resolve the git ref to use for fetching content.
 
@@ -65,13 +201,59 @@ async def resolve_github_ref(client: httpx.AsyncClient) -> str:
     return "main"
 
 
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying a response, honoring a Retry-After header in seconds."""
+    retry_after = response.headers.get("retry-after")
+    if retry_after is not None:
+        try:
+            return min(max(float(retry_after), 0.0), _MAX_RETRY_AFTER)
+        except ValueError:
+            pass
+    return float(2**attempt)
+
+
+async def _fetch_github_file(
+    client: httpx.AsyncClient,
+    url: str,
+    label: str,
+) -> str | None:
+    """Download a single file from GitHub raw content, see fetch_github_file."""
+    try:
+        for attempt in range(_MAX_FETCH_RETRIES + 1):
+            response = await client.get(url, follow_redirects=False)
+            if response.is_redirect:
+                logger.warning(
+                    f"Rejected redirect for {label}: {response.headers.get('location')}"
+                )
+                return None
+            retryable = response.status_code == 429 or response.is_server_error
+            if retryable and attempt < _MAX_FETCH_RETRIES:
+                delay = _retry_delay(response, attempt)
+                logger.warning(
+                    f"Got {response.status_code} fetching {label}, retrying in {delay}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            response.raise_for_status()
+            # raw.githubusercontent.com always serves UTF-8, so skip resolving the charset
+            return response.content.decode("utf-8", errors="replace")
+    except httpx.HTTPError as e:
+        logger.warning(f"Failed to fetch {label}: {e}")
+    return None
+
+
 async def fetch_github_file(
-    client: httpx.AsyncClient, url: str, label: str
+    client: httpx.AsyncClient,
+    url: str,
+    label: str,
 ) -> str | None:
     """Fetch a single file from GitHub raw content.
 
     Uses follow_redirects=False to prevent the server from silently
     resolving traversal paths to content outside the intended directory.
+    Rate-limited (429) and server error (5xx) responses are retried with
+    exponential backoff, honoring any Retry-After header. Concurrent requests
+    for the same URL share one download.
 
     Args:
         client: The HTTP client to use.
@@ -81,24 +263,149 @@ async def fetch_github_file(
     Returns:
         The file content as a string, or None if the fetch failed.
     """
+    task = _inflight_fetches.get(url)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.create_task(_fetch_github_file(client, url, label))
+        _inflight_fetches[url] = task
+
+        def forget(done: asyncio.Task) -> None:
+            if _inflight_fetches.get(url) is done:
+                del _inflight_fetches[url]
+
+        task.add_done_callback(forget)
+    # shield the shared download so one caller being cancelled does not cancel it for the others
+    return await asyncio.shield(task)
+
+
+async def fetch_github_files(
+    client: httpx.AsyncClient,
+    urls: dict[str, str],
+    workers: int = MAX_CONCURRENT_FETCHES,
+) -> dict[str, str]:
+    """Fetch many files from GitHub raw content with a fixed pool of workers.
+
+    The workers pull from a shared queue, so at most `workers` fetches (and tasks) exist at once however many
+    files are requested.
+
+    Args:
+        client: The HTTP client to use.
+        urls: Maps a label for each file (e.g. its path) to the URL to fetch it from.
+        workers: The number of concurrent fetches.
+
+    Returns:
+        Maps the label of each file that was fetched successfully to its content, in the order of urls.
+    """
+    queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
+    for item in urls.items():
+        queue.put_nowait(item)
+
+    fetched: dict[str, str] = {}
+
+    async def worker() -> None:
+        while True:
+            label, url = await queue.get()
+            try:
+                content = await fetch_github_file(client, url, label)
+                if content is not None:
+                    fetched[label] = content
+            finally:
+                queue.task_done()
+
+    tasks = [asyncio.create_task(worker()) for _ in range(min(workers, len(urls)))]
     try:
-        response = await client.get(url, follow_redirects=False)
-        if response.is_redirect:
-            logger.warning(
-                f"Rejected redirect for {label}: {response.headers.get('location')}"
-            )
+        await queue.join()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return {label: fetched[label] for label in urls if label in fetched}
+
+
+def _extract_tarball_files(
+    fileobj: IO[bytes], keep: Callable[[str], bool]
+) -> dict[str, str]:
+    """Read the text of the wanted files out of a gzipped GitHub tarball.
+
+    Member names are made relative to the repository root by dropping the
+    top-level directory GitHub wraps the snapshot in.
+    """
+    files: dict[str, str] = {}
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            _, _, path = member.name.partition("/")
+            if not keep(path):
+                continue
+            extracted = tar.extractfile(member)
+            if extracted is not None:
+                files[path] = extracted.read().decode("utf-8", errors="replace")
+    return files
+
+
+async def fetch_github_tarball_files(
+    client: httpx.AsyncClient, ref: str, keep: Callable[[str], bool]
+) -> dict[str, str] | None:
+    """Fetch the repository at ref as a single tarball and return the wanted files.
+
+    One download replaces a request per file. The archive is streamed into a
+    spooled temporary file and read sequentially, so only the wanted files are
+    decoded and held in memory. Writes to the spool and reading the archive
+    happen in worker threads, since the spool may spill to disk.
+
+    Args:
+        client: The HTTP client to use.
+        ref: The git ref to download.
+        keep: Predicate deciding, from its path relative to the repository
+            root, whether a file is wanted. It must reject unsafe paths.
+
+    Returns:
+        The wanted files mapped from path to content, or None if the tarball
+        could not be fetched or read.
+    """
+    url = f"https://codeload.github.com/{GITHUB_REPO}/tar.gz/{ref}"
+    with tempfile.SpooledTemporaryFile(max_size=_TARBALL_SPOOL_SIZE) as spool:
+        try:
+            async with client.stream("GET", url, follow_redirects=False) as response:
+                response.raise_for_status()
+                pending: list[bytes] = []
+                pending_size = 0
+                async for chunk in response.aiter_bytes():
+                    pending.append(chunk)
+                    pending_size += len(chunk)
+                    if pending_size >= _TARBALL_WRITE_SIZE:
+                        await asyncio.to_thread(spool.writelines, pending)
+                        pending, pending_size = [], 0
+                await asyncio.to_thread(spool.writelines, pending)
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to fetch tarball for {ref}: {e}")
+            return None
+        except OSError as e:
+            logger.warning(f"Failed to buffer tarball for {ref}: {e}")
+            return None
+
+        spool.seek(0)
+        try:
+            return await asyncio.to_thread(_extract_tarball_files, spool, keep)
+        except (tarfile.TarError, OSError, EOFError) as e:
+            logger.warning(f"Failed to read tarball for {ref}: {e}")
             return None
-        response.raise_for_status()
-        return response.text
-    except httpx.HTTPError as e:
-        logger.warning(f"Failed to fetch {label}: {e}")
-        return None
 
 
-def extract_excerpt(content: str, query: str, context_chars: int = 200) -> str:
-    """Extract an excerpt around the first match of query in content."""
+def extract_excerpt(
+    content: str,
+    query: str,
+    context_chars: int = 200,
+    content_lower: str | None = None,
+) -> str:
+    """Extract an excerpt around the first match of query in content.
+
+    Callers that already hold the lowercased content can pass it as content_lower to avoid lowercasing it again.
+    """
     query_lower = query.lower()
-    content_lower = content.lower()
+    if content_lower is None:
+        content_lower = content.lower()
 
     pos = content_lower.find(query_lower)
     if pos == -1:
@@ -109,14 +416,13 @@ def extract_excerpt(content: str, query: str, context_chars: int = 200) -> str:
     start = max(0, pos - context_chars // 2)
     end = min(len(content), pos + len(query) + context_chars // 2)
 
-    # Adjust to word boundaries
+    # Adjust to word boundaries, widening to just after the previous whitespace and up to the next one
     if start > 0:
-        while start > 0 and content[start - 1] not in " \n\t":
-            start -= 1
+        start = max(content.rfind(ws, 0, start) for ws in _EXCERPT_WHITESPACE) + 1
 
     if end < len(content):
-        while end < len(content) and content[end] not in " \n\t":
-            end += 1
+        ends = [content.find(ws, end) for ws in _EXCERPT_WHITESPACE]
+        end = min((i for i in ends if i != -1), default=len(content))
 
     excerpt = content[start:end].strip()
 
@@ -1,10 +1,16 @@
+import asyncio
+import copy
+import hashlib
 import io
+import stat
+import tempfile
+from collections import OrderedDict
+from collections.abc import Callable
 from enum import Enum
 from pathlib import Path
-from typing import TYPE_CHECKING, Protocol, TypeVar, cast
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar, cast
 from uuid import uuid4
 
-import aiofiles
 import kcl
 import trimesh
 
@@ -64,7 +70,7 @@ from kittycad.models.modeling_cmd import (
 )
 from kittycad.models.web_socket_request import OptionModelingCmdReq
 
-from zoo_mcp import ZooMCPException, kittycad_client, logger
+from zoo_mcp import ZooMCPException, call_with_retry, get_kittycad_client, logger
 from zoo_mcp.utils.image_utils import create_image_collage, resize_image
 
 SUPPORTED_EXTS = {x.value.lower() for x in FileImportFormat} | {"stp"}
@@ -74,6 +80,12 @@ _EXT_ALIASES = {
     "stp": "step",
 }
 
+# FileImportFormat members by value, so a format lookup is a single dict access
+_IMPORT_FORMATS: dict[str, FileImportFormat] = {f.value: f for f in FileImportFormat}
+
+# FileExportFormat members by value, for validating requested export formats and export path extensions
+_EXPORT_FORMATS: dict[str, FileExportFormat] = {f.value: f for f in FileExportFormat}
+
 # Mappings from user-facing short strings to kcl PyO3 enum members.
 # The kcl unit enums cannot be constructed from strings directly.
 UNIT_AREA_MAP: dict[str, kcl.UnitArea] = {
@@ -119,6 +131,11 @@ UNIT_DENSITY_MAP: dict[str, kcl.UnitDensity] = {
     "kg:m3": kcl.UnitDensity.KilogramsPerCubicMeter,
 }
 
+# File metric results keyed by the file's content digest and the requested units, least recently used first
+_METRIC_CACHE_SIZE = 256
+_metric_cache: OrderedDict[tuple, Any] = OrderedDict()
+# Content digests of recently measured files keyed by path, size and mtime, so unchanged files are not rehashed
+_file_digests: OrderedDict[tuple[str, int, int], bytes] = OrderedDict()
 
 _T = TypeVar("_T")
 
@@ -147,6 +164,118 @@ def _normalize_ext(ext: str) -> str:
     return _EXT_ALIASES.get(ext_lower, ext_lower)
 
 
+def _import_format(ext: str) -> FileImportFormat:
+    """Look up the FileImportFormat for a file extension (without the leading dot), case-insensitive."""
+    normalized = _normalize_ext(ext)
+    src_format = _IMPORT_FORMATS.get(normalized)
+    if src_format is None:
+        # let the enum raise its usual error for an unsupported extension
+        return FileImportFormat(normalized)
+    return src_format
+
+
+def _hash_file(file_path: Path) -> bytes:
+    """Hash a file in chunks so it is never held in memory as a whole."""
+    with open(file_path, "rb") as inp:
+        return hashlib.file_digest(inp, "blake2b").digest()
+
+
+async def _metric_cache_key(metric: str, file_path: Path, *params: object) -> tuple:
+    """Build a cache key for a file metric from the file's import format and content digest plus the request parameters.
+
+    The import format comes from the file extension and is checked first, so an unsupported file raises before any
+    cached value can be returned, and the same content under another format is measured separately. The digest is
+    reused while the file's resolved path, size and mtime are unchanged, otherwise the file is hashed again, so a file
+    that was rewritten with the same content, or copied elsewhere, still hits the cache.
+    """
+    src_format = _import_format(file_path.suffix[1:])
+    st = await asyncio.to_thread(file_path.stat)
+    file_state = (str(file_path), st.st_size, st.st_mtime_ns)
+    digest = _file_digests.get(file_state)
+    if digest is None:
+        digest = await asyncio.to_thread(_hash_file, file_path)
+        _file_digests[file_state] = digest
+        while len(_file_digests) > _METRIC_CACHE_SIZE:
+            _file_digests.popitem(last=False)
+    else:
+        _file_digests.move_to_end(file_state)
+    return (metric, src_format, digest, *params)
+
+
+def _metric_cache_get(key: tuple) -> Any | None:
+    """Return a copy of a cached file metric and mark it as most recently used."""
+    if key not in _metric_cache:
+        return None
+    _metric_cache.move_to_end(key)
+    return copy.deepcopy(_metric_cache[key])
+
+
+def _metric_cache_put(key: tuple, value: Any) -> None:
+    """Store a copy of a file metric, evicting the least recently used entry."""
+    _metric_cache[key] = copy.deepcopy(value)
+    _metric_cache.move_to_end(key)
+    while len(_metric_cache) > _METRIC_CACHE_SIZE:
+        _metric_cache.popitem(last=False)
+
+
+def _post_file(endpoint: Callable[..., _T], file_path: Path, **kwargs: Any) -> _T:
+    """Call a KittyCAD file endpoint with the file streamed from disk as the request body.
+
+    The SDK annotates the body as bytes but hands it straight to httpx, which uploads an open file in chunks with a
+    Content-Length taken from the file, so the file is never held in memory. The file is opened on every call so a
+    retried request sends it from the start.
+    """
+    with open(file_path, "rb") as body:
+        return endpoint(body=cast(bytes, body), **kwargs)
+
+
+def _temp_export_path(suffix: str, directory: Path | None = None) -> Path:
+    """Create an empty temporary file to export into and return its path."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=directory) as f:
+        return Path(f.name)
+
+
+def _export_file_path(export_path: Path | str | None, suffix: str) -> Path:
+    """Choose the file an export is written to, creating a temporary file when needed.
+
+    Args:
+        export_path (Path | str | None): The requested path. A file with a valid export extension is overwritten, a
+            directory gets a new temporary file, and so does the directory of a file with any other extension. If no
+            path is provided, a temporary file is created in the system temporary directory.
+        suffix (str): The suffix, including the leading dot, for a new temporary file.
+
+    Returns:
+        Path: The path to write the export to.
+    """
+    if export_path is None:
+        logger.warning("No export path provided, creating a temporary file")
+        return _temp_export_path(suffix)
+
+    export_path = Path(export_path)
+    ext = export_path.suffix[1:]
+    if ext:
+        if ext not in _EXPORT_FORMATS:
+            logger.warning(
+                "The provided export path does not have a valid extension, using a temporary file instead"
+            )
+            return _temp_export_path(suffix, export_path.parent.resolve())
+        logger.warning("The provided export path is a file, overwriting")
+        return export_path
+
+    export_path = _temp_export_path(suffix, export_path.resolve())
+    logger.info("Using provided export path: %s", export_path)
+    return export_path
+
+
+def _write_raw_file(path: Path, raw_file: kcl.RawFile) -> None:
+    """Write an exported kcl file to disk.
+
+    kcl hands the contents over as a list of ints, built anew on every access to the property, so both the
+    conversion and the bytes copy it needs are done here, off the event loop, and only once.
+    """
+    path.write_bytes(bytes(raw_file.contents))
+
+
 def _check_kcl_code_or_path(
     kcl_code: str | None,
     kcl_path: Path | str | None,
@@ -174,14 +303,17 @@ def _check_kcl_code_or_path(
 
     if kcl_path:
         kcl_path = Path(kcl_path)
-        if not kcl_path.exists():
+        # a single stat answers exists, is_file and is_dir
+        try:
+            mode = kcl_path.stat().st_mode
+        except (OSError, ValueError):
             logger.error("The provided kcl_path does not exist")
             raise ZooMCPException("The provided kcl_path does not exist")
-        if kcl_path.is_file() and kcl_path.suffix != ".kcl":
+        if stat.S_ISREG(mode) and kcl_path.suffix != ".kcl":
             logger.error("The provided kcl_path is not a .kcl file")
             raise ZooMCPException("The provided kcl_path is not a .kcl file")
         if (
-            kcl_path.is_dir()
+            stat.S_ISDIR(mode)
             and require_main_file
             and not (kcl_path / "main.kcl").is_file()
         ):
@@ -360,52 +492,88 @@ def _get_input_format(ext: str) -> InputFormat3d | None:
     return None
 
 
-async def zoo_calculate_center_of_mass(
+async def _calculate_file_metric(
+    name: str,
     file_path: Path | str,
-    unit_length: str,
-) -> dict[str, float]:
-    """Calculate the center of mass of the file
+    endpoint: Callable[..., Any],
+    result_type: type,
+    result_attr: str,
+    cache_params: tuple,
+    **api_kwargs: Any,
+) -> Any:
+    """Measure a property of a CAD file with a KittyCAD file endpoint, caching the result.
 
     Args:
-        file_path(Path | str): The path to the file. The file should be one of the supported formats: .fbx, .gltf, .obj, .ply, .sldprt, .step, .stp, .stl (case-insensitive)
-        unit_length(str): The unit length to return. This should be one of 'cm', 'ft', 'in', 'm', 'mm', 'yd'
+        name (str): The property being measured, for log and error messages.
+        file_path (Path | str): The path to the CAD file.
+        endpoint (Callable[..., Any]): The SDK file endpoint to call.
+        result_type (type): The response type the endpoint returns on success.
+        result_attr (str): The response attribute holding the measurement, also used to key the cache.
+        cache_params (tuple): The request parameters, as given by the caller, that the measurement depends on.
+        **api_kwargs: The remaining endpoint arguments, such as the output unit.
 
     Returns:
-        dict[str]: If the center of mass can be calculated return the center of mass as a dictionary with x, y, and z keys
+        The measurement, from the cache when the same file content was measured with the same parameters.
     """
-    file_path = Path(file_path)
-
-    logger.info("Calculating center of mass for %s", str(file_path.resolve()))
-
-    async with aiofiles.open(file_path, "rb") as inp:
-        data = await inp.read()
-
-    src_format = FileImportFormat(_normalize_ext(file_path.suffix.split(".")[1]))
-
-    result = kittycad_client.file.create_file_center_of_mass(
-        src_format=src_format,
-        body=data,
-        output_unit=UnitLength(unit_length),
+    file_path = Path(file_path).resolve()
+    key = await _metric_cache_key(result_attr, file_path, *cache_params)
+    cached = _metric_cache_get(key)
+    if cached is not None:
+        return cached
+
+    logger.info("Calculating %s for %s", name, file_path)
+
+    result = await call_with_retry(
+        _post_file,
+        endpoint,
+        file_path,
+        src_format=_import_format(file_path.suffix[1:]),
+        **api_kwargs,
     )
 
-    if not isinstance(result, FileCenterOfMass):
-        logger.info(
-            "Failed to calculate center of mass, incorrect return type %s",
-            type(result),
+    if not isinstance(result, result_type):
+        logger.error(
+            "Failed to calculate %s, incorrect return type %s", name, type(result)
         )
         raise ZooMCPException(
-            "Failed to calculate center of mass, incorrect return type %s",
-            type(result),
+            f"Failed to calculate {name}, incorrect return type {type(result)}"
         )
 
-    com = result.center_of_mass.to_dict() if result.center_of_mass is not None else None
+    value = getattr(result, result_attr)
 
-    if com is None:
-        raise ZooMCPException(
-            "Failed to calculate center of mass, no center of mass returned"
-        )
+    if value is None:
+        raise ZooMCPException(f"Failed to calculate {name}, no {name} returned")
 
-    return com
+    _metric_cache_put(key, value)
+    return value
+
+
+async def zoo_calculate_center_of_mass(
+    file_path: Path | str,
+    unit_length: str,
+) -> dict[str, float]:
+    """Calculate the center of mass of the file
+
+    Args:
+        file_path(Path | str): The path to the file. The file should be one of the supported formats: .fbx, .gltf, .obj, .ply, .sldprt, .step, .stp, .stl (case-insensitive)
+        unit_length(str): The unit length to return. This should be one of 'cm', 'ft', 'in', 'm', 'mm', 'yd'
+
+    Returns:
+        dict[str]: If the center of mass can be calculated return the center of mass as a dictionary with x, y, and z keys
+    """
+    # Validate units before reading the file or calling the API
+    output_unit = UnitLength(unit_length)
+
+    center_of_mass = await _calculate_file_metric(
+        "center of mass",
+        file_path,
+        get_kittycad_client().file.create_file_center_of_mass,
+        FileCenterOfMass,
+        "center_of_mass",
+        (unit_length,),
+        output_unit=output_unit,
+    )
+    return center_of_mass.to_dict()
 
 
 async def zoo_calculate_mass(
@@ -426,36 +594,22 @@ async def zoo_calculate_mass(
         float | None: If the mass of the file can be calculated, return the mass in the requested unit
     """
 
-    file_path = Path(file_path)
-
-    logger.info("Calculating mass for %s", str(file_path.resolve()))
-
-    async with aiofiles.open(file_path, "rb") as inp:
-        data = await inp.read()
-
-    src_format = FileImportFormat(_normalize_ext(file_path.suffix.split(".")[1]))
-
-    result = kittycad_client.file.create_file_mass(
-        output_unit=UnitMass(unit_mass),
-        src_format=src_format,
-        body=data,
-        material_density_unit=UnitDensity(unit_density),
+    # Validate units before reading the file or calling the API
+    output_unit = UnitMass(unit_mass)
+    density_unit = UnitDensity(unit_density)
+
+    return await _calculate_file_metric(
+        "mass",
+        file_path,
+        get_kittycad_client().file.create_file_mass,
+        FileMass,
+        "mass",
+        (unit_mass, unit_density, density),
+        output_unit=output_unit,
+        material_density_unit=density_unit,
         material_density=density,
     )
 
-    if not isinstance(result, FileMass):
-        logger.info("Failed to calculate mass, incorrect return type %s", type(result))
-        raise ZooMCPException(
-            "Failed to calculate mass, incorrect return type %s", type(result)
-        )
-
-    mass = result.mass
-
-    if mass is None:
-        raise ZooMCPException("Failed to calculate mass, no mass returned")
-
-    return mass
-
 
 async def zoo_calculate_surface_area(file_path: Path | str, unit_area: str) -> float:
     """Calculate the surface area of the file in the requested unit
@@ -468,39 +622,19 @@ async def zoo_calculate_surface_area(file_path: Path | str, unit_area: str) -> f
         float: If the surface area can be calculated return the surface area
     """
 
-    file_path = Path(file_path)
-
-    logger.info("Calculating surface area for %s", str(file_path.resolve()))
-
-    async with aiofiles.open(file_path, "rb") as inp:
-        data = await inp.read()
-
-    src_format = FileImportFormat(_normalize_ext(file_path.suffix.split(".")[1]))
-
-    result = kittycad_client.file.create_file_surface_area(
-        output_unit=UnitArea(unit_area),
-        src_format=src_format,
-        body=data,
+    # Validate units before reading the file or calling the API
+    output_unit = UnitArea(unit_area)
+
+    return await _calculate_file_metric(
+        "surface area",
+        file_path,
+        get_kittycad_client().file.create_file_surface_area,
+        FileSurfaceArea,
+        "surface_area",
+        (unit_area,),
+        output_unit=output_unit,
     )
 
-    if not isinstance(result, FileSurfaceArea):
-        logger.error(
-            "Failed to calculate surface area, incorrect return type %s",
-            type(result),
-        )
-        raise ZooMCPException(
-            "Failed to calculate surface area, incorrect return type %s",
-        )
-
-    surface_area = result.surface_area
-
-    if surface_area is None:
-        raise ZooMCPException(
-            "Failed to calculate surface area, no surface area returned"
-        )
-
-    return surface_area
-
 
 async def zoo_calculate_volume(file_path: Path | str, unit_vol: str) -> float:
     """Calculate the volume of the file in the requested unit
@@ -513,36 +647,19 @@ async def zoo_calculate_volume(file_path: Path | str, unit_vol: str) -> float:
         float: If the volume of the file can be calculated, return the volume in the requested unit
     """
 
-    file_path = Path(file_path)
-
-    logger.info("Calculating volume for %s", str(file_path.resolve()))
-
-    async with aiofiles.open(file_path, "rb") as inp:
-        data = await inp.read()
-
-    src_format = FileImportFormat(_normalize_ext(file_path.suffix.split(".")[1]))
-
-    result = kittycad_client.file.create_file_volume(
-        output_unit=UnitVolume(unit_vol),
-        src_format=src_format,
-        body=data,
+    # Validate units before reading the file or calling the API
+    output_unit = UnitVolume(unit_vol)
+
+    return await _calculate_file_metric(
+        "volume",
+        file_path,
+        get_kittycad_client().file.create_file_volume,
+        FileVolume,
+        "volume",
+        (unit_vol,),
+        output_unit=output_unit,
     )
 
-    if not isinstance(result, FileVolume):
-        logger.info(
-            "Failed to calculate volume, incorrect return type %s", type(result)
-        )
-        raise ZooMCPException(
-            "Failed to calculate volume, incorrect return type %s", type(result)
-        )
-
-    volume = result.volume
-
-    if volume is None:
-        raise ZooMCPException("Failed to calculate volume, no volume returned")
-
-    return volume
-
 
 async def zoo_calculate_cad_physical_properties(
     file_path: Path | str,
@@ -569,78 +686,112 @@ async def zoo_calculate_cad_physical_properties(
     Returns:
         dict: A dictionary with keys 'volume', 'mass', 'surface_area', 'center_of_mass', and 'bounding_box'.
     """
-    file_path = Path(file_path)
-
-    logger.info("Calculating physical properties for %s", str(file_path.resolve()))
-
-    async with aiofiles.open(file_path, "rb") as inp:
-        data = await inp.read()
-
-    normalized_ext = _normalize_ext(file_path.suffix.split(".")[1])
-    src_format = FileImportFormat(normalized_ext)
-
-    volume_result = kittycad_client.file.create_file_volume(
-        output_unit=UnitVolume(unit_vol),
-        src_format=src_format,
-        body=data,
+    # Validate units before reading the file or calling the API
+    length_unit = UnitLength(unit_length)
+    mass_unit = UnitMass(unit_mass)
+    density_unit = UnitDensity(unit_density)
+    area_unit = UnitArea(unit_area)
+    volume_unit = UnitVolume(unit_vol)
+    file_path = Path(file_path).resolve()
+    key = await _metric_cache_key(
+        "physical_properties",
+        file_path,
+        unit_length,
+        unit_mass,
+        unit_density,
+        density,
+        unit_area,
+        unit_vol,
     )
-    if not isinstance(volume_result, FileVolume) or volume_result.volume is None:
-        raise ZooMCPException("Failed to calculate volume")
-
-    mass_result = kittycad_client.file.create_file_mass(
-        output_unit=UnitMass(unit_mass),
-        src_format=src_format,
-        body=data,
-        material_density_unit=UnitDensity(unit_density),
-        material_density=density,
-    )
-    if not isinstance(mass_result, FileMass) or mass_result.mass is None:
-        raise ZooMCPException("Failed to calculate mass")
-
-    sa_result = kittycad_client.file.create_file_surface_area(
-        output_unit=UnitArea(unit_area),
-        src_format=src_format,
-        body=data,
-    )
-    if not isinstance(sa_result, FileSurfaceArea) or sa_result.surface_area is None:
-        raise ZooMCPException("Failed to calculate surface area")
-
-    com_result = kittycad_client.file.create_file_center_of_mass(
-        src_format=src_format,
-        body=data,
-        output_unit=UnitLength(unit_length),
+    cached = _metric_cache_get(key)
+    if cached is not None:
+        return cached
+
+    logger.info("Calculating physical properties for %s", file_path)
+
+    normalized_ext = _normalize_ext(file_path.suffix[1:])
+
+    # The metric endpoints are independent, so run the blocking SDK calls concurrently in worker threads. Each
+    # metric goes through the same cache as its single-metric tool, so anything already measured for this file
+    # is not uploaded again, and the results answer later single-metric calls.
+    client = get_kittycad_client()
+    calls = [
+        _calculate_file_metric(
+            "volume",
+            file_path,
+            client.file.create_file_volume,
+            FileVolume,
+            "volume",
+            (unit_vol,),
+            output_unit=volume_unit,
+        ),
+        _calculate_file_metric(
+            "mass",
+            file_path,
+            client.file.create_file_mass,
+            FileMass,
+            "mass",
+            (unit_mass, unit_density, density),
+            output_unit=mass_unit,
+            material_density_unit=density_unit,
+            material_density=density,
+        ),
+        _calculate_file_metric(
+            "surface area",
+            file_path,
+            client.file.create_file_surface_area,
+            FileSurfaceArea,
+            "surface_area",
+            (unit_area,),
+            output_unit=area_unit,
+        ),
+        _calculate_file_metric(
+            "center of mass",
+            file_path,
+            client.file.create_file_center_of_mass,
+            FileCenterOfMass,
+            "center_of_mass",
+            (unit_length,),
+            output_unit=length_unit,
+        ),
+    ]
+    # The bounding box is computed from mesh data, so non-STL files are converted alongside
+    if normalized_ext != "stl":
+        calls.append(
+            call_with_retry(
+                _post_file,
+                client.file.create_file_conversion,
+                file_path,
+                src_format=_import_format(normalized_ext),
+                output_format=FileExportFormat.STL,
+            )
+        )
+    volume, mass, surface_area, center_of_mass, *conversion = await asyncio.gather(
+        *calls
     )
-    if (
-        not isinstance(com_result, FileCenterOfMass)
-        or com_result.center_of_mass is None
-    ):
-        raise ZooMCPException("Failed to calculate center of mass")
 
-    # Compute bounding box from mesh data
     if normalized_ext == "stl":
+        data = await asyncio.to_thread(file_path.read_bytes)
         bbox = _compute_stl_bounding_box(data)
     else:
-        stl_result = kittycad_client.file.create_file_conversion(
-            src_format=src_format,
-            output_format=FileExportFormat.STL,
-            body=data,
-        )
+        stl_result = conversion[0]
         if not isinstance(stl_result, FileConversion):
             raise ZooMCPException("Failed to convert file for bounding box calculation")
         if stl_result.outputs is None or len(stl_result.outputs) == 0:
             raise ZooMCPException(
                 "Failed to convert file for bounding box calculation, no output"
             )
-        bbox = _compute_stl_bounding_box(list(stl_result.outputs.values())[0])
+        bbox = _compute_stl_bounding_box(next(iter(stl_result.outputs.values())))
 
     physical_properties = {
-        "volume": volume_result.volume,
-        "mass": mass_result.mass,
-        "surface_area": sa_result.surface_area,
-        "center_of_mass": com_result.center_of_mass.to_dict(),
+        "volume": volume,
+        "mass": mass,
+        "surface_area": surface_area,
+        "center_of_mass": center_of_mass.to_dict(),
         "bounding_box": bbox,
     }
 
+    _metric_cache_put(key, physical_properties)
     return physical_properties
 
 
@@ -802,26 +953,26 @@ async def zoo_calculate_bounding_box_cad(
     Returns:
         dict: A dictionary with 'center' (dict with x,y,z) and 'dimensions' (dict with x,y,z). The unit of the center and dimensions is the same as original unit of the CAD file.
     """
-    file_path = Path(file_path)
+    file_path = Path(file_path).resolve()
 
-    logger.info("Calculating bounding box for %s", str(file_path.resolve()))
+    logger.info("Calculating bounding box for %s", file_path)
 
-    async with aiofiles.open(file_path, "rb") as inp:
-        data = await inp.read()
-
-    normalized_ext = _normalize_ext(file_path.suffix.split(".")[1])
+    normalized_ext = _normalize_ext(file_path.suffix[1:])
 
     # If the file is already STL, parse it directly
     if normalized_ext == "stl":
+        data = await asyncio.to_thread(file_path.read_bytes)
         return _compute_stl_bounding_box(data)
 
-    src_format = FileImportFormat(normalized_ext)
+    src_format = _import_format(normalized_ext)
 
     # Convert to STL to get mesh data for bounding box computation
-    stl_result = kittycad_client.file.create_file_conversion(
+    stl_result = await call_with_retry(
+        _post_file,
+        get_kittycad_client().file.create_file_conversion,
+        file_path,
         src_format=src_format,
         output_format=FileExportFormat.STL,
-        body=data,
     )
 
     if not isinstance(stl_result, FileConversion):
@@ -835,7 +986,7 @@ async def zoo_calculate_bounding_box_cad(
             "Failed to convert file for bounding box calculation, no output"
         )
 
-    stl_data = list(stl_result.outputs.values())[0]
+    stl_data = next(iter(stl_result.outputs.values()))
 
     return _compute_stl_bounding_box(stl_data)
 
@@ -857,61 +1008,36 @@ async def zoo_convert_cad_file(
     """
 
     input_path = Path(input_path)
-    input_ext = input_path.suffix.split(".")[1].lower()
+    input_ext = input_path.suffix[1:].lower()
     if input_ext not in SUPPORTED_EXTS:
         logger.error("The provided input path does not have a valid extension")
         raise ZooMCPException("The provided input path does not have a valid extension")
-    logger.info("Converting the cad file %s", str(input_path.resolve()))
+    logger.info("Converting the cad file %s", input_path)
 
     # check the export format
     if not export_format:
         logger.warning("No export format provided, defaulting to step")
         export_format = FileExportFormat.STEP
     else:
-        if export_format not in FileExportFormat:
+        output_format = _EXPORT_FORMATS.get(export_format)
+        if output_format is None:
             logger.warning(
                 "Invalid export format %s provided, defaulting to step", export_format
             )
             export_format = FileExportFormat.STEP
         else:
-            export_format = FileExportFormat(export_format)
-
-    if export_path is None:
-        logger.warning("No export path provided, creating a temporary file")
-        export_path = await aiofiles.tempfile.NamedTemporaryFile(
-            delete=False, suffix=f".{export_format.value.lower()}"
-        )
-        export_path = Path(export_path.name)
-    else:
-        export_path = Path(export_path)
-        if export_path.suffix:
-            ext = export_path.suffix.split(".")[1]
-            if ext not in [i.value for i in FileExportFormat]:
-                logger.warning(
-                    "The provided export path does not have a valid extension, using a temporary file instead"
-                )
-                export_path = await aiofiles.tempfile.NamedTemporaryFile(
-                    dir=export_path.parent.resolve(),
-                    delete=False,
-                    suffix=f".{export_format.value.lower()}",
-                )
-            else:
-                logger.warning("The provided export path is a file, overwriting")
-        else:
-            export_path = await aiofiles.tempfile.NamedTemporaryFile(
-                dir=export_path.resolve(),
-                delete=False,
-                suffix=f".{export_format.value.lower()}",
-            )
-            logger.info("Using provided export path: %s", str(export_path.name))
+            export_format = output_format
 
-    async with aiofiles.open(input_path, "rb") as inp:
-        data = await inp.read()
+    export_path = await asyncio.to_thread(
+        _export_file_path, export_path, f".{export_format.value.lower()}"
+    )
 
-    export_response = kittycad_client.file.create_file_conversion(
-        src_format=FileImportFormat(_normalize_ext(input_ext)),
-        output_format=FileExportFormat(export_format),
-        body=data,
+    export_response = await call_with_retry(
+        _post_file,
+        get_kittycad_client().file.create_file_conversion,
+        input_path,
+        src_format=_import_format(input_ext),
+        output_format=export_format,
     )
 
     if not isinstance(export_response, FileConversion):
@@ -927,10 +1053,11 @@ async def zoo_convert_cad_file(
         logger.error("Failed to convert file")
         raise ZooMCPException("Failed to convert file no output response")
 
-    async with aiofiles.open(export_path, "wb") as out:
-        await out.write(list(export_response.outputs.values())[0])
+    await asyncio.to_thread(
+        export_path.write_bytes, next(iter(export_response.outputs.values()))
+    )
 
-    logger.info("KCL project exported successfully to %s", str(export_path.resolve()))
+    logger.info("KCL project exported successfully to %s", export_path)
 
     return export_path
 
@@ -986,65 +1113,44 @@ async def zoo_export_kcl(
 
     _check_kcl_code_or_path(kcl_code, kcl_path)
 
-    # check the export format
+    # check the export format, kcl enum members are used as given and strings are looked up by value
     if not export_format:
         logger.warning("No export format provided, defaulting to step")
         export_format = kcl.FileExportFormat.Step
-    else:
-        if export_format not in KCLExportFormat.formats.value.keys():
+    elif not isinstance(export_format, kcl.FileExportFormat):
+        output_format = KCLExportFormat.formats.value.get(export_format)
+        if output_format is None:
             logger.warning(
                 "Invalid export format %s provided, defaulting to step", export_format
             )
-            export_format = kcl.FileExportFormat.Step
-        else:
-            export_format = KCLExportFormat.formats.value[export_format]
+            output_format = kcl.FileExportFormat.Step
+        export_format = output_format
 
-    if export_path is None:
-        logger.warning("No export path provided, creating a temporary file")
-        export_path = await aiofiles.tempfile.NamedTemporaryFile(
-            delete=False, suffix=f".{str(export_format).split('.')[1].lower()}"
-        )
-        export_path = Path(export_path.name)
-    else:
-        export_path = Path(export_path)
-        if export_path.suffix:
-            ext = export_path.suffix.split(".")[1]
-            if ext not in [i.value for i in FileExportFormat]:
-                logger.warning(
-                    "The provided export path does not have a valid extension, using a temporary file instead"
-                )
-                export_path = await aiofiles.tempfile.NamedTemporaryFile(
-                    dir=export_path.parent.resolve(),
-                    delete=False,
-                    suffix=f".{str(export_format).split('.')[1].lower()}",
-                )
-            else:
-                logger.warning("The provided export path is a file, overwriting")
-        else:
-            export_path = await aiofiles.tempfile.NamedTemporaryFile(
-                dir=export_path.resolve(),
-                delete=False,
-                suffix=f".{str(export_format).split('.')[1].lower()}",
-            )
-            logger.info("Using provided export path: %s", str(export_path.name))
+    export_path = await asyncio.to_thread(
+        _export_file_path, export_path, f".{str(export_format).split('.')[1].lower()}"
+    )
 
-    async with aiofiles.open(export_path, "wb") as out:
-        if kcl_code:
-            logger.info("Exporting KCL code to %s", str(kcl_code))
-            export_response = await kcl.execute_code_and_export(kcl_code, export_format)
-        else:
-            logger.info("Exporting KCL project to %s", str(kcl_path))
-            assert kcl_path is not None  # _check_kcl_code_or_path ensures this
-            kcl_path_resolved = Path(kcl_path)
-            export_response = await kcl.execute_and_export(
-                str(kcl_path_resolved.resolve()), export_format
-            )
-        await out.write(bytes(export_response[0].contents))
+    if kcl_code:
+        logger.info("Exporting KCL code to %s", kcl_code)
+        export_response = await kcl.execute_code_and_export(kcl_code, export_format)
+    else:
+        logger.info("Exporting KCL project to %s", kcl_path)
+        assert kcl_path is not None  # _check_kcl_code_or_path ensures this
+        kcl_path_resolved = Path(kcl_path)
+        export_response = await kcl.execute_and_export(
+            str(kcl_path_resolved.resolve()), export_format
+        )
+    await asyncio.to_thread(_write_raw_file, export_path, export_response[0])
 
-    logger.info("KCL exported successfully to %s", str(export_path))
+    logger.info("KCL exported successfully to %s", export_path)
     return Path(export_path)
 
 
+def _format_kcl_file(path: Path) -> None:
+    """Format a single .kcl file in place."""
+    path.write_text(kcl.format(path.read_text()))
+
+
 async def zoo_format_kcl(
     kcl_code: str | None,
     kcl_path: Path | str | None,
@@ -1072,9 +1178,7 @@ async def zoo_format_kcl(
             assert kcl_path is not None
             path = Path(kcl_path)
             if path.is_file():
-                code = path.read_text()
-                formatted = kcl.format(code)
-                path.write_text(formatted)
+                await asyncio.to_thread(_format_kcl_file, path)
             else:
                 await kcl.format_dir(str(kcl_path))
             return None
@@ -1270,7 +1374,7 @@ def zoo_multiview_snapshot_of_cad(
 
     # Connect to the websocket.
     with (
-        kittycad_client.modeling.modeling_commands_ws(
+        get_kittycad_client().modeling.modeling_commands_ws(
             fps=30,
             post_effect=PostEffectType.SSAO,
             show_grid=False,
@@ -1284,7 +1388,7 @@ def zoo_multiview_snapshot_of_cad(
         # Import files request must be sent as binary, because the file contents might be binary.
         import_id = ModelingCmdId(uuid4())
 
-        input_ext = input_path.suffix.split(".")[1].lower()
+        input_ext = input_path.suffix[1:].lower()
         if input_ext not in SUPPORTED_EXTS:
             logger.error("The provided input path does not have a valid extension")
             raise ZooMCPException(
@@ -1438,7 +1542,7 @@ def zoo_multi_isometric_snapshot_of_cad(
 
     # Connect to the websocket.
     with (
-        kittycad_client.modeling.modeling_commands_ws(
+        get_kittycad_client().modeling.modeling_commands_ws(
             fps=30,
             post_effect=PostEffectType.SSAO,
             show_grid=False,
@@ -1452,7 +1556,7 @@ def zoo_multi_isometric_snapshot_of_cad(
         # Import files request must be sent as binary, because the file contents might be binary.
         import_id = ModelingCmdId(uuid4())
 
-        input_ext = input_path.suffix.split(".")[1].lower()
+        input_ext = input_path.suffix[1:].lower()
         if input_ext not in SUPPORTED_EXTS:
             logger.error("The provided input path does not have a valid extension")
             raise ZooMCPException(
@@ -1651,9 +1755,9 @@ async def zoo_multi_isometric_snapshot_of_kcl(
                 ),
             )
 
-        collage = create_image_collage(jpeg_contents_list)
+        collage = await asyncio.to_thread(create_image_collage, jpeg_contents_list)
 
-        return resize_image(collage, max_image_dimension)
+        return await asyncio.to_thread(resize_image, collage, max_image_dimension)
 
     except Exception as e:
         logger.error("Failed to take multi-isometric snapshot: %s", e)
@@ -1743,9 +1847,9 @@ async def zoo_multiview_snapshot_of_kcl(
                 ),
             )
 
-        collage = create_image_collage(jpeg_contents_list)
+        collage = await asyncio.to_thread(create_image_collage, jpeg_contents_list)
 
-        return resize_image(collage, max_image_dimension)
+        return await asyncio.to_thread(resize_image, collage, max_image_dimension)
 
     except Exception as e:
         logger.error("Failed to take multiview snapshot: %s", e)
@@ -1776,7 +1880,7 @@ def zoo_snapshot_of_cad(
 
     # Connect to the websocket.
     with (
-        kittycad_client.modeling.modeling_commands_ws(
+        get_kittycad_client().modeling.modeling_commands_ws(
             fps=30,
             post_effect=PostEffectType.SSAO,
             show_grid=False,
@@ -1790,7 +1894,7 @@ def zoo_snapshot_of_cad(
         # Import files request must be sent as binary, because the file contents might be binary.
         import_id = ModelingCmdId(uuid4())
 
-        input_ext = input_path.suffix.split(".")[1].lower()
+        input_ext = input_path.suffix[1:].lower()
         if input_ext not in SUPPORTED_EXTS:
             logger.error("The provided input path does not have a valid extension")
             raise ZooMCPException(
@@ -3,6 +3,8 @@ from pathlib import Path
 
 import pytest
 
+from zoo_mcp.utils import data_retrieval_utils
+
 
 @pytest.fixture
 def cube_kcl():
@@ -66,3 +68,16 @@ def fully_constrained_kcl():
 def under_constrained_kcl():
     test_file = Path(__file__).parent / "data" / "under_constrained_sketch.kcl"
     yield f"{test_file.resolve()}"
+
+
+@pytest.fixture(autouse=True)
+def zoo_mcp_cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "zoo-mcp-cache"
+    monkeypatch.setenv("ZOO_MCP_CACHE_DIR", str(cache_dir))
+    yield cache_dir
+
+
+@pytest.fixture(autouse=True)
+def reset_release_tag(monkeypatch):
+    monkeypatch.setattr(data_retrieval_utils, "_release_tag", None)
+    monkeypatch.setattr(data_retrieval_utils, "_release_tag_task", None)
@@ -0,0 +1,320 @@
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+from kittycad.exceptions import KittyCADServerError
+from kittycad.models import ApiCallStatus
+from kittycad.models.text_to_cad_response import (
+    OptionTextToCad,
+    OptionTextToCadMultiFileIteration,
+)
+
+from zoo_mcp import ai_tools
+from zoo_mcp.ai_tools import (
+    _cache_key,
+    _discover_files,
+    _JobWaiter,
+    edit_kcl_project,
+    text_to_cad,
+)
+
+
+class FakeTextToCad:
+    """Stands in for the KittyCAD ml API, finishing every job once ``ready`` is set."""
+
+    def __init__(self):
+        self.created: list[str] = []
+        self.failing: set[str] = set()
+        self.ready = threading.Event()
+        self.ready.set()
+        self._jobs: dict[str, tuple[str, bool]] = {}
+
+    def _create(self, prompt: str, multi_file: bool) -> SimpleNamespace:
+        self.created.append(prompt)
+        job_id = f"job-{len(self.created)}"
+        self._jobs[job_id] = (prompt, multi_file)
+        return SimpleNamespace(id=job_id)
+
+    def create_text_to_cad(self, output_format, kcl, body):
+        return self._create(body.prompt, multi_file=False)
+
+    def create_text_to_cad_multi_file_iteration(self, body, file_attachments):
+        return self._create(body.prompt, multi_file=True)
+
+    def get_text_to_cad_part_for_user(self, id):
+        prompt, multi_file = self._jobs[id]
+        if not self.ready.is_set():
+            status = ApiCallStatus.IN_PROGRESS
+        elif prompt in self.failing:
+            status = ApiCallStatus.FAILED
+        else:
+            status = ApiCallStatus.COMPLETED
+        error = f"could not model {prompt}"
+        if multi_file:
+            response = OptionTextToCadMultiFileIteration.model_construct(
+                status=status, outputs={"main.kcl": f"code for {prompt}"}, error=error
+            )
+        else:
+            response = OptionTextToCad.model_construct(
+                status=status, code=f"code for {prompt}", error=error
+            )
+        return SimpleNamespace(root=response)
+
+
+@pytest.fixture
+def t2c(monkeypatch):
+    fake = FakeTextToCad()
+    monkeypatch.setattr(
+        ai_tools, "get_kittycad_client", lambda: SimpleNamespace(ml=fake)
+    )
+    monkeypatch.setattr(ai_tools, "log_websocket_message", lambda job_id: True)
+    monkeypatch.setattr(ai_tools, "_job_waiter", _JobWaiter(initial=0.01, cap=0.02))
+    monkeypatch.setattr(ai_tools, "_t2c_cache", OrderedDict())
+    monkeypatch.setattr(ai_tools, "_inflight", {})
+    return fake
+
+
+async def _wait_until(condition, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.005)
+
+
+class TestInflightRequests:
+    """Tests for sharing one Text-To-CAD job between identical concurrent requests."""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_job(self, t2c):
+        t2c.ready.clear()
+        first = asyncio.create_task(text_to_cad("a cube"))
+        second = asyncio.create_task(text_to_cad("a cube"))
+        await _wait_until(lambda: t2c.created)
+        t2c.ready.set()
+
+        assert await asyncio.gather(first, second) == ["code for a cube"] * 2
+        assert t2c.created == ["a cube"]
+        assert ai_tools._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self, t2c):
+        t2c.ready.clear()
+        first = asyncio.create_task(text_to_cad("a cube"))
+        await _wait_until(lambda: t2c.created)
+        second = asyncio.create_task(text_to_cad("a cube"))
+        await asyncio.sleep(0.02)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        t2c.ready.set()
+
+        assert await second == "code for a cube"
+        assert t2c.created == ["a cube"]
+
+
+class TestResponseCache:
+    """Tests for the Text-To-CAD response cache."""
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_the_api(self, t2c):
+        assert await text_to_cad("a cube") == "code for a cube"
+        assert await text_to_cad("a cube") == "code for a cube"
+        assert t2c.created == ["a cube"]
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted(self, t2c, monkeypatch):
+        monkeypatch.setattr(ai_tools, "_CACHE_SIZE", 2)
+        await text_to_cad("a cube")
+        await text_to_cad("a gear")
+        await text_to_cad("a cube")
+        await text_to_cad("a bolt")
+        assert len(ai_tools._t2c_cache) == 2
+
+        await text_to_cad("a cube")
+        await text_to_cad("a gear")
+        assert t2c.created == ["a cube", "a gear", "a bolt", "a gear"]
+
+    @pytest.mark.asyncio
+    async def test_disabled_with_zero_size(self, t2c, monkeypatch):
+        monkeypatch.setattr(ai_tools, "_CACHE_SIZE", 0)
+        await text_to_cad("a cube")
+        await text_to_cad("a cube")
+        assert t2c.created == ["a cube", "a cube"]
+        assert not ai_tools._t2c_cache
+
+    @pytest.mark.asyncio
+    async def test_prompts_keyed_separately(self, t2c):
+        assert await text_to_cad("a cube") == "code for a cube"
+        assert await text_to_cad("a gear") == "code for a gear"
+        assert t2c.created == ["a cube", "a gear"]
+
+    @pytest.mark.asyncio
+    async def test_job_creation_not_retried_after_server_error(self, t2c, monkeypatch):
+        attempts = []
+
+        def create_text_to_cad(**kwargs):
+            attempts.append(kwargs)
+            raise KittyCADServerError("gateway timeout", status_code=504)
+
+        monkeypatch.setattr(t2c, "create_text_to_cad", create_text_to_cad)
+        with pytest.raises(KittyCADServerError):
+            await text_to_cad("a cube")
+        assert len(attempts) == 1
+        assert not ai_tools._t2c_cache
+
+    def test_key_parts_do_not_run_together(self):
+        assert _cache_key("ab", "c") != _cache_key("a", "bc")
+        assert _cache_key("a", b"b") == _cache_key("a", "b")
+
+    @pytest.mark.asyncio
+    async def test_project_files_are_part_of_the_key(self, t2c, tmp_path):
+        main = tmp_path / "main.kcl"
+        main.write_text("cube()")
+        first = await edit_kcl_project("make it bigger", tmp_path)
+        assert first == {"main.kcl": "code for make it bigger"}
+        assert await edit_kcl_project("make it bigger", tmp_path) == first
+        assert t2c.created == ["make it bigger"]
+
+        main.write_text("gear()")
+        await edit_kcl_project("make it bigger", tmp_path)
+        (tmp_path / "parts").mkdir()
+        (tmp_path / "parts" / "bolt.kcl").write_text("bolt()")
+        await edit_kcl_project("make it bigger", tmp_path)
+        assert t2c.created == ["make it bigger"] * 3
+
+    @pytest.mark.asyncio
+    async def test_failed_jobs_not_cached(self, t2c):
+        t2c.failing.add("a cube")
+        assert await text_to_cad("a cube") == "could not model a cube"
+        assert not ai_tools._t2c_cache
+
+        t2c.failing.clear()
+        assert await text_to_cad("a cube") == "code for a cube"
+        assert t2c.created == ["a cube", "a cube"]
+
+
+class TestJobWaiter:
+    """Tests for the shared Text-To-CAD job poller."""
+
+    @pytest.fixture
+    def polls(self, monkeypatch):
+        """Script the poll results for each job id: each poll takes the next result, repeating the last one."""
+        polls = SimpleNamespace(scripts={}, calls=[])
+
+        def poll(id):
+            polls.calls.append(id)
+            script = polls.scripts[id]
+            result = script.pop(0) if len(script) > 1 else script[0]
+            if isinstance(result, Exception):
+                raise result
+            return SimpleNamespace(root=SimpleNamespace(status=result))
+
+        monkeypatch.setattr(
+            ai_tools,
+            "get_kittycad_client",
+            lambda: SimpleNamespace(
+                ml=SimpleNamespace(get_text_to_cad_part_for_user=poll)
+            ),
+        )
+        return polls
+
+    @pytest.mark.asyncio
+    async def test_jobs_complete_out_of_order(self, polls):
+        polls.scripts["slow"] = [ApiCallStatus.IN_PROGRESS] * 2 + [
+            ApiCallStatus.COMPLETED
+        ]
+        polls.scripts["fast"] = [ApiCallStatus.COMPLETED]
+        waiter = _JobWaiter(initial=0.01, cap=0.02)
+        slow = waiter.watch("slow")
+        fast = waiter.watch("fast")
+
+        done, _ = await asyncio.wait({slow, fast}, return_when=asyncio.FIRST_COMPLETED)
+        assert done == {fast}
+        assert (await slow).root.status == ApiCallStatus.COMPLETED
+        assert polls.calls.count("slow") == 3
+        assert polls.calls.count("fast") == 1
+
+    @pytest.mark.asyncio
+    async def test_poll_error_reaches_only_its_job(self, polls):
+        polls.scripts["bad"] = [ValueError("no such job")]
+        polls.scripts["good"] = [ApiCallStatus.QUEUED, ApiCallStatus.COMPLETED]
+        waiter = _JobWaiter(initial=0.01, cap=0.02)
+        bad = waiter.watch("bad")
+        good = waiter.watch("good")
+
+        with pytest.raises(ValueError, match="no such job"):
+            await bad
+        assert (await good).root.status == ApiCallStatus.COMPLETED
+        assert polls.calls.count("bad") == 1
+
+    @pytest.mark.asyncio
+    async def test_new_job_wakes_sleeping_poller(self, polls):
+        polls.scripts["slow"] = [ApiCallStatus.IN_PROGRESS]
+        polls.scripts["fast"] = [ApiCallStatus.COMPLETED]
+        waiter = _JobWaiter(initial=30.0, cap=30.0)
+        slow = waiter.watch("slow")
+        await _wait_until(lambda: polls.calls)
+
+        # the poller is now sleeping until the slow job is due again
+        async with asyncio.timeout(2):
+            await waiter.watch("fast")
+        assert polls.calls == ["slow", "fast"]
+        slow.cancel()
+        assert waiter._task is not None
+        waiter._task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_poller_stops_when_idle_and_restarts(self, polls):
+        polls.scripts["first"] = [ApiCallStatus.COMPLETED]
+        polls.scripts["second"] = [ApiCallStatus.FAILED]
+        waiter = _JobWaiter(initial=0.01, cap=0.02)
+
+        await waiter.watch("first")
+        first_task = waiter._task
+        assert first_task is not None
+        async with asyncio.timeout(2):
+            await first_task
+        assert waiter._jobs == {}
+
+        assert (await waiter.watch("second")).root.status == ApiCallStatus.FAILED
+        assert waiter._task is not first_task
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs FIFOs and symlinks")
+class TestDiscoverFiles:
+    """Tests for listing the files of a project to attach."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        project = tmp_path / "project"
+        (project / "parts" / "nested").mkdir(parents=True)
+        (project / "main.kcl").write_text("cube()")
+        (project / "parts" / "bolt.kcl").write_text("bolt()")
+        (project / "parts" / "nested" / "nut.kcl").write_text("nut()")
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "secret.kcl").write_text("secret()")
+        (project / "linked.kcl").symlink_to(project / "main.kcl")
+        (project / "dangling.kcl").symlink_to(project / "missing.kcl")
+        (project / "linked_dir").symlink_to(outside, target_is_directory=True)
+        os.mkfifo(project / "pipe.kcl")
+        return project
+
+    def test_only_regular_files_listed(self, project):
+        file_paths, rel_paths = _discover_files(project)
+        assert sorted(rel_paths) == [
+            "linked.kcl",
+            "main.kcl",
+            os.path.join("parts", "bolt.kcl"),
+            os.path.join("parts", "nested", "nut.kcl"),
+        ]
+        assert all(fp == project / rel for fp, rel in zip(file_paths, rel_paths))
+
+    @pytest.mark.asyncio
+    async def test_special_files_not_attached(self, project, t2c):
+        async with asyncio.timeout(5):
+            result = await edit_kcl_project("make it bigger", project)
+        assert result == {"main.kcl": "code for make it bigger"}
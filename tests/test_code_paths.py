@@ -1,7 +1,29 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import kcl
 import pytest
+from kittycad.exceptions import KittyCADClientError, KittyCADServerError
+from kittycad.models import FileImportFormat, Point3d
 
-from zoo_mcp import ZooMCPException
-from zoo_mcp.zoo_tools import _check_kcl_code_or_path
+from zoo_mcp import ZooMCPException, call_with_retry, zoo_tools
+from zoo_mcp.zoo_tools import (
+    _check_kcl_code_or_path,
+    _export_file_path,
+    _import_format,
+    _metric_cache_get,
+    _metric_cache_key,
+    _metric_cache_put,
+    _post_file,
+    _temp_export_path,
+    zoo_calculate_cad_physical_properties,
+    zoo_calculate_volume,
+    zoo_export_kcl,
+)
 
 
 def test_check_kcl_code_or_path_with_code_only():
@@ -73,3 +95,318 @@ def test_check_kcl_code_or_path_nonexistent_path():
     with pytest.raises(ZooMCPException) as exc_info:
         _check_kcl_code_or_path(kcl_code=None, kcl_path="/nonexistent/path/to/file.kcl")
     assert "does not exist" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_metric_cache_key_tracks_file_changes(tmp_path):
+    """Test that the metric cache key changes when the file is modified."""
+    cad_file = tmp_path / "part.stl"
+    cad_file.write_bytes(b"solid a")
+    key = await _metric_cache_key("volume", cad_file, "cm3")
+    assert await _metric_cache_key("volume", cad_file, "cm3") == key
+    assert await _metric_cache_key("volume", cad_file, "m3") != key
+
+    cad_file.write_bytes(b"solid part")
+    assert await _metric_cache_key("volume", cad_file, "cm3") != key
+
+
+@pytest.mark.asyncio
+async def test_metric_cache_key_follows_content(tmp_path):
+    """Test that identical content shares a cache key whatever its path or mtime."""
+    cad_file = tmp_path / "part.stl"
+    cad_file.write_bytes(b"solid a")
+    key = await _metric_cache_key("volume", cad_file, "cm3")
+
+    copied = tmp_path / "copy.stl"
+    copied.write_bytes(b"solid a")
+    assert await _metric_cache_key("volume", copied, "cm3") == key
+
+    st = cad_file.stat()
+    os.utime(cad_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert await _metric_cache_key("volume", cad_file, "cm3") == key
+
+
+@pytest.mark.asyncio
+async def test_metric_cache_key_includes_import_format(tmp_path, monkeypatch):
+    """Test that the same content under another format is keyed separately, and an unsupported one is rejected."""
+    monkeypatch.setattr(zoo_tools, "_metric_cache", OrderedDict())
+    cad_file = tmp_path / "part.stl"
+    cad_file.write_bytes(b"solid a")
+    key = await _metric_cache_key("volume", cad_file, "cm3")
+
+    upper = tmp_path / "upper.STL"
+    upper.write_bytes(b"solid a")
+    assert await _metric_cache_key("volume", upper, "cm3") == key
+
+    as_obj = tmp_path / "part.obj"
+    as_obj.write_bytes(b"solid a")
+    assert await _metric_cache_key("volume", as_obj, "cm3") != key
+
+    _metric_cache_put(key, 1.0)
+    unsupported = tmp_path / "part.xyz"
+    unsupported.write_bytes(b"solid a")
+    with pytest.raises(ValueError, match="not a valid FileImportFormat"):
+        await zoo_calculate_volume(file_path=unsupported, unit_vol="cm3")
+
+
+@pytest.mark.asyncio
+async def test_metric_cache_returns_copies(tmp_path):
+    """Test that callers cannot modify a cached metric."""
+    cad_file = tmp_path / "part.stl"
+    cad_file.write_bytes(b"solid a")
+    key = await _metric_cache_key("center_of_mass", cad_file, "mm")
+    assert _metric_cache_get(key) is None
+
+    com = {"x": 1.0, "y": 2.0, "z": 3.0}
+    _metric_cache_put(key, com)
+    com["x"] = 0.0
+    cached = _metric_cache_get(key)
+    assert cached == {"x": 1.0, "y": 2.0, "z": 3.0}
+    cached["y"] = 0.0
+    assert _metric_cache_get(key) == {"x": 1.0, "y": 2.0, "z": 3.0}
+
+
+@pytest.mark.asyncio
+async def test_physical_properties_reuse_single_metrics(cube_stl, monkeypatch):
+    """Test that metrics already measured by the single-metric tools are not uploaded again."""
+    monkeypatch.setattr(zoo_tools, "_metric_cache", OrderedDict())
+    cad_file = Path(cube_stl)
+
+    def upload(**kwargs):
+        pytest.fail("cached metric was uploaded again")
+
+    endpoints = dict.fromkeys(
+        [
+            "create_file_volume",
+            "create_file_mass",
+            "create_file_surface_area",
+            "create_file_center_of_mass",
+        ],
+        upload,
+    )
+    monkeypatch.setattr(
+        zoo_tools,
+        "get_kittycad_client",
+        lambda: SimpleNamespace(file=SimpleNamespace(**endpoints)),
+    )
+    _metric_cache_put(await _metric_cache_key("volume", cad_file, "cm3"), 1.0)
+    _metric_cache_put(await _metric_cache_key("mass", cad_file, "g", "kg:m3", 2.0), 2.0)
+    _metric_cache_put(await _metric_cache_key("surface_area", cad_file, "cm2"), 6.0)
+    _metric_cache_put(
+        await _metric_cache_key("center_of_mass", cad_file, "mm"),
+        Point3d(x=5.0, y=5.0, z=-5.0),
+    )
+
+    properties = await zoo_calculate_cad_physical_properties(
+        file_path=cube_stl,
+        unit_length="mm",
+        unit_mass="g",
+        unit_density="kg:m3",
+        density=2.0,
+        unit_area="cm2",
+        unit_vol="cm3",
+    )
+    assert properties["volume"] == 1.0
+    assert properties["mass"] == 2.0
+    assert properties["surface_area"] == 6.0
+    assert properties["center_of_mass"] == {"x": 5.0, "y": 5.0, "z": -5.0}
+    assert set(properties["bounding_box"]) == {"center", "dimensions"}
+    assert await zoo_calculate_volume(cube_stl, "cm3") == 1.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("export_format", "expected"),
+    [
+        (kcl.FileExportFormat.Stl, kcl.FileExportFormat.Stl),
+        ("glb", kcl.FileExportFormat.Glb),
+        ("asdf", kcl.FileExportFormat.Step),
+        (None, kcl.FileExportFormat.Step),
+    ],
+)
+async def test_export_kcl_format_selection(
+    tmp_path, monkeypatch, export_format, expected
+):
+    """Test that kcl export formats are accepted as enum members or strings, with step as the fallback."""
+    formats = []
+
+    async def export(code, export_format):
+        formats.append(export_format)
+        return [SimpleNamespace(contents=[115, 111, 108, 105, 100])]
+
+    monkeypatch.setattr(kcl, "execute_code_and_export", export, raising=False)
+    export_path = tmp_path / "part.out"
+    await zoo_export_kcl(
+        kcl_code="cube()", export_path=tmp_path, export_format=export_format
+    )
+    assert formats == [expected]
+    assert len(list(tmp_path.iterdir())) == 1
+    assert next(tmp_path.iterdir()).read_bytes() == b"solid"
+    assert not export_path.exists()
+
+
+def test_post_file_streams_whole_file_on_every_call(tmp_path):
+    """Test that the request body is the full file, with its length, each time the endpoint is called."""
+    cad_file = tmp_path / "part.stl"
+    cad_file.write_bytes(b"solid part" * 10_000)
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append((request.headers.get("content-length"), request.read()))
+        return httpx.Response(200)
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+
+        def endpoint(body, src_format):
+            return client.post(f"https://api.example.com/{src_format}", content=body)
+
+        assert _post_file(endpoint, cad_file, src_format="stl").status_code == 200
+        _post_file(endpoint, cad_file, src_format="stl")
+
+    expected = (str(cad_file.stat().st_size), cad_file.read_bytes())
+    assert received == [expected, expected]
+
+
+def test_temp_export_path(tmp_path):
+    """Test that the temporary export file is created empty in the requested directory."""
+    path = _temp_export_path(".step", tmp_path)
+    assert path.parent == tmp_path
+    assert path.suffix == ".step"
+    assert path.read_bytes() == b""
+
+
+def test_export_file_path(tmp_path):
+    """Test that export files with a known extension are kept and others become temporary files."""
+    assert _export_file_path(tmp_path / "part.stl", ".step") == tmp_path / "part.stl"
+    for name in ("part.txt", "part.STL"):
+        replaced = _export_file_path(tmp_path / name, ".step")
+        assert replaced.parent == tmp_path
+        assert replaced.suffix == ".step"
+    in_dir = _export_file_path(tmp_path, ".obj")
+    assert in_dir.parent == tmp_path
+    assert in_dir.suffix == ".obj"
+
+
+@pytest.mark.asyncio
+async def test_invalid_unit_rejected_before_reading_file(tmp_path):
+    """Test that an invalid unit fails before the file is opened or sent anywhere."""
+    missing = tmp_path / "missing.stl"
+    with pytest.raises(ValueError, match="not a valid UnitVolume"):
+        await zoo_calculate_volume(file_path=missing, unit_vol="cubits")
+
+    with pytest.raises(ValueError, match="not a valid UnitDensity"):
+        await zoo_calculate_cad_physical_properties(
+            file_path=missing,
+            unit_length="mm",
+            unit_mass="g",
+            unit_density="g:cc",
+            density=1.0,
+            unit_area="mm2",
+            unit_vol="cm3",
+        )
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_retries_transient_errors():
+    """Test that transient network errors are retried and other errors are raised at once."""
+    calls = []
+
+    def flaky(value):
+        calls.append(value)
+        if len(calls) < 3:
+            raise httpx.ConnectError("connection refused")
+        return value
+
+    assert await call_with_retry(flaky, 7, backoff_base=0) == 7
+    assert calls == [7, 7, 7]
+
+    def broken():
+        calls.append(None)
+        raise ValueError("bad request")
+
+    calls.clear()
+    with pytest.raises(ValueError):
+        await call_with_retry(broken, backoff_base=0)
+    assert calls == [None]
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_gives_up():
+    """Test that the last transient error is raised once the attempts are used up."""
+    calls = []
+
+    def down():
+        calls.append(None)
+        raise httpx.ConnectError("connection refused")
+
+    with pytest.raises(httpx.ConnectError):
+        await call_with_retry(down, max_retries=2, backoff_base=0)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_server_errors():
+    """Test that rate limiting and 5xx responses are retried and other API errors are not."""
+    responses = [
+        KittyCADServerError("unavailable", status_code=503),
+        KittyCADClientError("slow down", status_code=429),
+        "ok",
+    ]
+
+    def endpoint():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert await call_with_retry(endpoint, backoff_base=0) == "ok"
+
+    responses[:] = [KittyCADClientError("bad request", status_code=400), "ok"]
+    with pytest.raises(KittyCADClientError):
+        await call_with_retry(endpoint, backoff_base=0)
+    assert responses == ["ok"]
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_non_idempotent_only_retries_connect_errors():
+    """Test that a call that is not idempotent is retried only when it could not connect."""
+    calls = []
+
+    def create(error):
+        calls.append(error)
+        if len(calls) == 1:
+            raise error
+        return "created"
+
+    connect_error = httpx.ConnectError("connection refused")
+    assert (
+        await call_with_retry(create, connect_error, idempotent=False, backoff_base=0)
+        == "created"
+    )
+
+    for error in [
+        KittyCADServerError("gateway timeout", status_code=504),
+        KittyCADClientError("slow down", status_code=429),
+        httpx.ReadTimeout("timed out"),
+    ]:
+        calls.clear()
+        with pytest.raises(type(error)):
+            await call_with_retry(create, error, idempotent=False, backoff_base=0)
+        assert calls == [error]
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_uses_api_pool():
+    """Test that SDK calls run on the dedicated API threads rather than the default executor."""
+    assert (await call_with_retry(lambda: threading.current_thread().name)).startswith(
+        "zoo-api"
+    )
+
+
+def test_import_format_lookup():
+    """Test that file extensions map to import formats, including aliases and any case."""
+    assert _import_format("STEP") == FileImportFormat.STEP
+    assert _import_format("stp") == FileImportFormat.STEP
+    assert _import_format("Stl") == FileImportFormat.STL
+    with pytest.raises(ValueError, match="not a valid FileImportFormat"):
+        _import_format("")
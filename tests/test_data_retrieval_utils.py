@@ -1,94 +1,109 @@
+import asyncio
+import io
+import re
+import tarfile
+
 import httpx
 import pytest
+from pytest_httpx import IteratorStream
 
 from zoo_mcp.kcl_docs import _SAFE_DOC_PATH_RE
 from zoo_mcp.kcl_samples import _SAFE_FILENAME_RE, _SAFE_NAME_RE
+from zoo_mcp.utils import data_retrieval_utils
 from zoo_mcp.utils.data_retrieval_utils import (
+    close_github_client,
     extract_excerpt,
     fetch_github_file,
-    is_safe_path_component,
+    fetch_github_files,
+    fetch_github_tarball_files,
+    get_github_client,
+    load_cached_data,
     resolve_github_ref,
     resolve_latest_release_tag,
+    store_cached_data,
 )
 
 # ---------------------------------------------------------------------------
-# is_safe_path_component
+# safe path patterns
 # ---------------------------------------------------------------------------
 
 
-class TestIsSafePathComponent:
-    """Tests for is_safe_path_component."""
+def is_safe(value: str, pattern: re.Pattern[str]) -> bool:
+    return pattern.fullmatch(value) is not None
+
+
+class TestSafePathPatterns:
+    """Tests for the allowlist patterns that sample names, sample filenames and doc paths must fully match."""
 
     def test_valid_simple_name(self):
-        assert is_safe_path_component("axial-fan", _SAFE_NAME_RE) is True
+        assert is_safe("axial-fan", _SAFE_NAME_RE) is True
 
     def test_valid_name_with_underscore(self):
-        assert is_safe_path_component("my_sample", _SAFE_NAME_RE) is True
+        assert is_safe("my_sample", _SAFE_NAME_RE) is True
 
     def test_valid_name_alphanumeric(self):
-        assert is_safe_path_component("gear123", _SAFE_NAME_RE) is True
+        assert is_safe("gear123", _SAFE_NAME_RE) is True
 
     def test_empty_string(self):
-        assert is_safe_path_component("", _SAFE_NAME_RE) is False
+        assert is_safe("", _SAFE_NAME_RE) is False
 
     def test_dot_dot_traversal(self):
-        assert is_safe_path_component("..", _SAFE_NAME_RE) is False
+        assert is_safe("..", _SAFE_NAME_RE) is False
 
     def test_slash_in_name(self):
-        assert is_safe_path_component("a/b", _SAFE_NAME_RE) is False
+        assert is_safe("a/b", _SAFE_NAME_RE) is False
 
     def test_url_encoded_dot_dot(self):
         """URL-encoded '..' (%2e%2e) should be rejected."""
-        assert is_safe_path_component("%2e%2e", _SAFE_NAME_RE) is False
+        assert is_safe("%2e%2e", _SAFE_NAME_RE) is False
 
     def test_url_encoded_slash(self):
         """URL-encoded '/' (%2f) should be rejected."""
-        assert is_safe_path_component("%2f", _SAFE_NAME_RE) is False
+        assert is_safe("%2f", _SAFE_NAME_RE) is False
 
     def test_double_encoded_dot_dot(self):
         """Double-encoded '..' (%252e%252e) should be rejected."""
-        assert is_safe_path_component("%252e%252e", _SAFE_NAME_RE) is False
+        assert is_safe("%252e%252e", _SAFE_NAME_RE) is False
 
     def test_percent_sign(self):
-        assert is_safe_path_component("a%b", _SAFE_NAME_RE) is False
+        assert is_safe("a%b", _SAFE_NAME_RE) is False
 
     def test_space(self):
-        assert is_safe_path_component("a b", _SAFE_NAME_RE) is False
+        assert is_safe("a b", _SAFE_NAME_RE) is False
+
+    def test_trailing_newline(self):
+        assert is_safe("axial-fan\n", _SAFE_NAME_RE) is False
+
+    def test_non_ascii_letters(self):
+        assert is_safe("ge\u00e4r", _SAFE_NAME_RE) is False
 
     def test_valid_kcl_filename(self):
-        assert is_safe_path_component("main.kcl", _SAFE_FILENAME_RE) is True
+        assert is_safe("main.kcl", _SAFE_FILENAME_RE) is True
 
     def test_valid_kcl_filename_with_hyphens(self):
-        assert is_safe_path_component("my-part.kcl", _SAFE_FILENAME_RE) is True
+        assert is_safe("my-part.kcl", _SAFE_FILENAME_RE) is True
 
     def test_kcl_filename_with_path_traversal(self):
-        assert is_safe_path_component("../main.kcl", _SAFE_FILENAME_RE) is False
+        assert is_safe("../main.kcl", _SAFE_FILENAME_RE) is False
 
     def test_kcl_filename_with_slash(self):
-        assert is_safe_path_component("dir/main.kcl", _SAFE_FILENAME_RE) is False
+        assert is_safe("dir/main.kcl", _SAFE_FILENAME_RE) is False
 
     def test_kcl_filename_wrong_extension(self):
-        assert is_safe_path_component("main.py", _SAFE_FILENAME_RE) is False
+        assert is_safe("main.py", _SAFE_FILENAME_RE) is False
 
     def test_valid_doc_path(self):
-        assert (
-            is_safe_path_component("docs/kcl-lang/functions.md", _SAFE_DOC_PATH_RE)
-            is True
-        )
+        assert is_safe("docs/kcl-lang/functions.md", _SAFE_DOC_PATH_RE) is True
 
     def test_doc_path_with_encoded_traversal(self):
         """The regex blocks '%' so encoded traversal is rejected."""
         assert (
-            is_safe_path_component(
-                "docs/kcl-lang/%2e%2e%2f%2e%2e%2fREADME.md", _SAFE_DOC_PATH_RE
-            )
+            is_safe("docs/kcl-lang/%2e%2e%2f%2e%2e%2fREADME.md", _SAFE_DOC_PATH_RE)
             is False
         )
 
     def test_doc_path_with_literal_dot_dot(self):
-        assert (
-            is_safe_path_component("docs/../etc/passwd.md", _SAFE_DOC_PATH_RE) is False
-        )
+        assert is_safe("docs/../etc/passwd.md", _SAFE_DOC_PATH_RE) is False
 
 
 # ---------------------------------------------------------------------------
@@ -139,6 +154,15 @@ class TestExtractExcerpt:
         assert excerpt.startswith("...")
         assert excerpt.endswith("...")
 
+    def test_widens_to_any_whitespace(self):
+        content = "alpha\tbravo-charlie keyword delta-echo\nfoxtrot golf"
+        excerpt = extract_excerpt(content, "keyword", context_chars=10)
+        assert excerpt == "...bravo-charlie keyword delta-echo..."
+
+    def test_no_whitespace_to_widen_to(self):
+        content = "x" * 30 + "keyword" + "y" * 30
+        assert extract_excerpt(content, "keyword", context_chars=10) == content
+
 
 # ---------------------------------------------------------------------------
 # fetch_github_file
@@ -160,6 +184,37 @@ class TestFetchGithubFile:
             )
         assert result == "file content"
 
+    @pytest.mark.asyncio
+    async def test_concurrent_fetches_share_download(self, httpx_mock):
+        httpx_mock.add_response(
+            url="https://example.com/file.txt",
+            text="file content",
+        )
+        async with httpx.AsyncClient() as client:
+            results = await asyncio.gather(
+                *[
+                    fetch_github_file(
+                        client, "https://example.com/file.txt", "file.txt"
+                    )
+                    for _ in range(3)
+                ]
+            )
+        assert results == ["file content"] * 3
+        assert len(httpx_mock.get_requests()) == 1
+
+    @pytest.mark.asyncio
+    async def test_sequential_fetches_download_again(self, httpx_mock):
+        httpx_mock.add_response(url="https://example.com/file.txt", text="v1")
+        httpx_mock.add_response(url="https://example.com/file.txt", text="v2")
+        async with httpx.AsyncClient() as client:
+            first = await fetch_github_file(
+                client, "https://example.com/file.txt", "file.txt"
+            )
+            second = await fetch_github_file(
+                client, "https://example.com/file.txt", "file.txt"
+            )
+        assert (first, second) == ("v1", "v2")
+
     @pytest.mark.asyncio
     async def test_redirect_rejected(self, httpx_mock):
         httpx_mock.add_response(
@@ -185,12 +240,215 @@ class TestFetchGithubFile:
             )
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_rate_limited_fetch_retried(self, httpx_mock, monkeypatch):
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(
+            "zoo_mcp.utils.data_retrieval_utils.asyncio.sleep", fake_sleep
+        )
+        httpx_mock.add_response(
+            url="https://example.com/file.txt",
+            status_code=429,
+            headers={"retry-after": "5"},
+        )
+        httpx_mock.add_response(url="https://example.com/file.txt", status_code=503)
+        httpx_mock.add_response(
+            url="https://example.com/file.txt",
+            text="file content",
+        )
+        async with httpx.AsyncClient() as client:
+            result = await fetch_github_file(
+                client, "https://example.com/file.txt", "file.txt"
+            )
+        assert result == "file content"
+        assert delays == [5.0, 2.0]
+
+    @pytest.mark.asyncio
+    async def test_server_error_gives_up_after_retries(self, httpx_mock, monkeypatch):
+        async def fake_sleep(delay):
+            pass
+
+        monkeypatch.setattr(
+            "zoo_mcp.utils.data_retrieval_utils.asyncio.sleep", fake_sleep
+        )
+        httpx_mock.add_response(
+            url="https://example.com/file.txt", status_code=500, is_reusable=True
+        )
+        async with httpx.AsyncClient() as client:
+            result = await fetch_github_file(
+                client, "https://example.com/file.txt", "file.txt"
+            )
+        assert result is None
+        assert len(httpx_mock.get_requests()) == 4
+
+
+# ---------------------------------------------------------------------------
+# fetch_github_tarball_files
+# ---------------------------------------------------------------------------
+
+
+class TestFetchGithubFiles:
+    """Tests for fetch_github_files."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_in_order_and_skips_failures(self, httpx_mock):
+        for name in ["a", "c", "d"]:
+            httpx_mock.add_response(
+                url=f"https://example.com/{name}.txt", text=f"{name} content"
+            )
+        httpx_mock.add_response(url="https://example.com/b.txt", status_code=404)
+        urls = {name: f"https://example.com/{name}.txt" for name in "dcba"}
+        async with httpx.AsyncClient() as client:
+            result = await fetch_github_files(client, urls, workers=2)
+        assert list(result.items()) == [
+            ("d", "d content"),
+            ("c", "c content"),
+            ("a", "a content"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded_by_workers(self, httpx_mock):
+        in_flight = 0
+        peak = 0
+
+        async def respond(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, text="ok")
+
+        httpx_mock.add_callback(respond, is_reusable=True)
+        urls = {str(i): f"https://example.com/{i}.txt" for i in range(10)}
+        async with httpx.AsyncClient() as client:
+            result = await fetch_github_files(client, urls, workers=3)
+        assert len(result) == 10
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_no_files(self):
+        async with httpx.AsyncClient() as client:
+            assert await fetch_github_files(client, {}) == {}
+
+
+def _make_tarball(files: dict[str, bytes], symlinks: dict[str, str] | None = None):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(f"KittyCAD-modeling-app-abc123/{name}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+        for name, target in (symlinks or {}).items():
+            info = tarfile.TarInfo(f"KittyCAD-modeling-app-abc123/{name}")
+            info.type = tarfile.SYMTYPE
+            info.linkname = target
+            tar.addfile(info)
+    return buffer.getvalue()
+
+
+class TestFetchGithubTarballFiles:
+    """Tests for fetch_github_tarball_files."""
+
+    _URL = "https://codeload.github.com/KittyCAD/modeling-app/tar.gz/v1.0.0"
+
+    @staticmethod
+    def _keep(path: str) -> bool:
+        return _SAFE_DOC_PATH_RE.fullmatch(path) is not None
+
+    @pytest.mark.asyncio
+    async def test_extracts_wanted_files(self, httpx_mock):
+        httpx_mock.add_response(
+            url=self._URL,
+            content=_make_tarball(
+                {
+                    "docs/kcl-lang/functions.md": b"# Functions",
+                    "docs/kcl-std/functions/std-extrude.md": b"# extrude",
+                    "src/main.ts": b"console.log()",
+                    "docs/../secrets.md": b"nope",
+                },
+                symlinks={"docs/kcl-lang/link.md": "../../secrets.md"},
+            ),
+        )
+        async with httpx.AsyncClient() as client:
+            result = await fetch_github_tarball_files(client, "v1.0.0", self._keep)
+        assert result == {
+            "docs/kcl-lang/functions.md": "# Functions",
+            "docs/kcl-std/functions/std-extrude.md": "# extrude",
+        }
+
+    @pytest.mark.asyncio
+    async def test_large_tarball_spilled_to_disk(self, httpx_mock, monkeypatch):
+        monkeypatch.setattr(data_retrieval_utils, "_TARBALL_SPOOL_SIZE", 64)
+        monkeypatch.setattr(data_retrieval_utils, "_TARBALL_WRITE_SIZE", 32)
+        content = _make_tarball(
+            {"docs/kcl-lang/functions.md": b"# Functions\n" + b"x" * 4096}
+        )
+        chunks = [content[i : i + 16] for i in range(0, len(content), 16)]
+        httpx_mock.add_response(url=self._URL, stream=IteratorStream(chunks))
+        async with httpx.AsyncClient() as client:
+            result = await fetch_github_tarball_files(client, "v1.0.0", self._keep)
+        assert result == {"docs/kcl-lang/functions.md": "# Functions\n" + "x" * 4096}
+
+    @pytest.mark.asyncio
+    async def test_http_error_returns_none(self, httpx_mock):
+        httpx_mock.add_response(url=self._URL, status_code=404)
+        async with httpx.AsyncClient() as client:
+            result = await fetch_github_tarball_files(client, "v1.0.0", self._keep)
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_redirect_rejected(self, httpx_mock):
+        httpx_mock.add_response(
+            url=self._URL,
+            status_code=302,
+            headers={"location": "https://evil.com/payload.tar.gz"},
+        )
+        async with httpx.AsyncClient() as client:
+            result = await fetch_github_tarball_files(client, "v1.0.0", self._keep)
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_corrupt_tarball_returns_none(self, httpx_mock):
+        httpx_mock.add_response(url=self._URL, content=b"not a tarball")
+        async with httpx.AsyncClient() as client:
+            result = await fetch_github_tarball_files(client, "v1.0.0", self._keep)
+        assert result is None
+
 
 # ---------------------------------------------------------------------------
 # resolve_latest_release_tag / resolve_github_ref
 # ---------------------------------------------------------------------------
 
 
+class TestGetGithubClient:
+    """Tests for the shared GitHub client."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused(self):
+        client = get_github_client()
+        try:
+            assert get_github_client() is client
+        finally:
+            await close_github_client()
+        assert client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_closed_client_is_replaced(self):
+        client = get_github_client()
+        await close_github_client()
+        replacement = get_github_client()
+        try:
+            assert replacement is not client
+            assert not replacement.is_closed
+        finally:
+            await close_github_client()
+
+
 class TestResolveRelease:
     """Tests for resolve_latest_release_tag and resolve_github_ref."""
 
@@ -243,3 +501,87 @@ class TestResolveRelease:
         async with httpx.AsyncClient() as client:
             ref = await resolve_github_ref(client)
         assert ref == "main"
+
+    @pytest.mark.asyncio
+    async def test_tag_reused_within_ttl(self, httpx_mock):
+        httpx_mock.add_response(
+            url="https://api.github.com/repos/KittyCAD/modeling-app/releases/latest",
+            json={"tag_name": "kcl-42"},
+        )
+        async with httpx.AsyncClient() as client:
+            assert await resolve_latest_release_tag(client) == "kcl-42"
+            assert await resolve_github_ref(client) == "kcl-42"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_request(self, httpx_mock):
+        httpx_mock.add_response(
+            url="https://api.github.com/repos/KittyCAD/modeling-app/releases/latest",
+            json={"tag_name": "kcl-42"},
+        )
+        async with httpx.AsyncClient() as client:
+            tags = await asyncio.gather(
+                resolve_latest_release_tag(client), resolve_latest_release_tag(client)
+            )
+        assert tags == ["kcl-42", "kcl-42"]
+
+    @pytest.mark.asyncio
+    async def test_expired_tag_revalidated_with_etag(self, httpx_mock, monkeypatch):
+        monkeypatch.setattr(data_retrieval_utils, "_RELEASE_TAG_TTL", 0.0)
+        httpx_mock.add_response(
+            url="https://api.github.com/repos/KittyCAD/modeling-app/releases/latest",
+            json={"tag_name": "kcl-42"},
+            headers={"ETag": '"v1"'},
+        )
+        httpx_mock.add_response(
+            url="https://api.github.com/repos/KittyCAD/modeling-app/releases/latest",
+            match_headers={"If-None-Match": '"v1"'},
+            status_code=304,
+        )
+        async with httpx.AsyncClient() as client:
+            assert await resolve_latest_release_tag(client) == "kcl-42"
+            assert await resolve_latest_release_tag(client) == "kcl-42"
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_not_cached(self, httpx_mock):
+        httpx_mock.add_response(
+            url="https://api.github.com/repos/KittyCAD/modeling-app/releases/latest",
+            status_code=500,
+        )
+        httpx_mock.add_response(
+            url="https://api.github.com/repos/KittyCAD/modeling-app/releases/latest",
+            json={"tag_name": "kcl-42"},
+        )
+        async with httpx.AsyncClient() as client:
+            assert await resolve_latest_release_tag(client) is None
+            assert await resolve_latest_release_tag(client) == "kcl-42"
+
+
+class TestDiskCache:
+    """Tests for load_cached_data and store_cached_data."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, zoo_mcp_cache_dir):
+        await store_cached_data("docs", "kcl-1.2", {"docs/a.md": "# A"})
+        assert (zoo_mcp_cache_dir / "docs-kcl-1.2.json").is_file()
+        assert await load_cached_data("docs", "kcl-1.2") == {"docs/a.md": "# A"}
+
+    @pytest.mark.asyncio
+    async def test_missing(self):
+        assert await load_cached_data("docs", "kcl-1.2") is None
+
+    @pytest.mark.asyncio
+    async def test_main_not_cached(self, zoo_mcp_cache_dir):
+        await store_cached_data("docs", "main", {"docs/a.md": "# A"})
+        assert not zoo_mcp_cache_dir.exists()
+        assert await load_cached_data("docs", "main") is None
+
+    @pytest.mark.asyncio
+    async def test_unsafe_ref_not_cached(self, zoo_mcp_cache_dir):
+        await store_cached_data("docs", "../escape", {"docs/a.md": "# A"})
+        assert not zoo_mcp_cache_dir.exists()
+
+    @pytest.mark.asyncio
+    async def test_corrupt_file_ignored(self, zoo_mcp_cache_dir):
+        zoo_mcp_cache_dir.mkdir()
+        (zoo_mcp_cache_dir / "docs-kcl-1.json").write_text("{not json")
+        assert await load_cached_data("docs", "kcl-1") is None
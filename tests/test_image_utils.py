@@ -0,0 +1,44 @@
+import io
+
+import pytest
+from PIL import Image
+
+from zoo_mcp.utils.image_utils import create_image_collage
+
+
+def _jpeg(color: str, size: tuple[int, int]) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", size, color).save(out, format="JPEG")
+    return out.getvalue()
+
+
+class TestCreateImageCollage:
+    """Tests for create_image_collage."""
+
+    @pytest.mark.parametrize("size", [(64, 48), (65, 49)])
+    def test_quadrants(self, size):
+        colors = ["red", "lime", "blue", "white"]
+        collage = Image.open(
+            io.BytesIO(create_image_collage([_jpeg(c, size) for c in colors]))
+        )
+        assert collage.size == size
+
+        w, h = size
+        centers = [(w // 4, h // 4), (3 * w // 4, h // 4), (w // 4, 3 * h // 4)]
+        centers.append((3 * w // 4, 3 * h // 4))
+        for center, color in zip(centers, colors):
+            expected = Image.new("RGB", (1, 1), color).getpixel((0, 0))
+            actual = collage.getpixel(center)
+            assert isinstance(expected, tuple)
+            assert isinstance(actual, tuple)
+            assert all(abs(a - e) < 16 for a, e in zip(actual, expected))
+
+    def test_mismatched_sizes_rejected(self):
+        images = [_jpeg("red", (64, 48))] * 3 + [_jpeg("red", (32, 48))]
+        with pytest.raises(ValueError, match="same dimensions"):
+            create_image_collage(images)
+
+    def test_resample_filter_selectable(self):
+        images = [_jpeg(c, (64, 48)) for c in ["red", "lime", "blue", "white"]]
+        collage = create_image_collage(images, resample=Image.Resampling.LANCZOS)
+        assert Image.open(io.BytesIO(collage)).size == (64, 48)
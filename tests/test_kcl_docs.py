@@ -0,0 +1,154 @@
+import httpx
+import pytest
+
+import zoo_mcp.kcl_docs
+from zoo_mcp.kcl_docs import (
+    KCLDocs,
+    _extract_title,
+    _fetch_doc_files,
+    _is_safe_doc_path,
+    search_docs,
+)
+
+
+@pytest.fixture
+def kcl_docs(monkeypatch):
+    docs = KCLDocs()
+    docs.add(
+        "docs/kcl-std/functions/std-sketch-extrude.md",
+        "# extrude\n\nExtend a 2-dimensional sketch through a third dimension. Extrude, extrude, extrude.",
+    )
+    docs.add(
+        "docs/kcl-std/functions/std-solid-fillet.md",
+        "# fillet\n\nBlend a transitional edge with a radius. Use fillet_radius to extrude nothing.",
+    )
+    docs.add(
+        "docs/kcl-lang/settings.md",
+        "# Settings\n\nSet the default length unit with @settings(defaultLengthUnit = mm).",
+    )
+    monkeypatch.setattr(zoo_mcp.kcl_docs, "_DOCS", docs)
+    return docs
+
+
+class TestSearchDocs:
+    """Tests for search_docs over the term index."""
+
+    def test_whole_word_counts(self, kcl_docs):
+        results = search_docs("extrude")
+        assert [r["path"] for r in results] == [
+            "docs/kcl-std/functions/std-sketch-extrude.md",
+            "docs/kcl-std/functions/std-solid-fillet.md",
+        ]
+        assert [r["match_count"] for r in results] == [4, 1]
+        assert results[0]["title"] == "extrude"
+
+    def test_partial_word_matches_inside_terms(self, kcl_docs):
+        results = search_docs("RADIU")
+        assert len(results) == 1
+        assert results[0]["path"] == "docs/kcl-std/functions/std-solid-fillet.md"
+        assert results[0]["match_count"] == 2
+
+    def test_query_spanning_terms(self, kcl_docs):
+        results = search_docs("unit = mm")
+        assert len(results) == 1
+        assert results[0]["path"] == "docs/kcl-lang/settings.md"
+
+    def test_punctuation_only_query(self, kcl_docs):
+        results = search_docs("@")
+        assert [r["path"] for r in results] == ["docs/kcl-lang/settings.md"]
+
+    def test_counts_match_substring_search(self, kcl_docs):
+        for query in ["e", "ex", "dim", "_", "t. e", "a 2-d"]:
+            expected = {
+                path: content.lower().count(query)
+                for path, content in kcl_docs.docs.items()
+                if query in content.lower()
+            }
+            results = search_docs(query, max_results=10)
+            assert {r["path"]: r["match_count"] for r in results} == expected
+
+    def test_no_match(self, kcl_docs):
+        assert search_docs("chamfer") == []
+
+    def test_empty_query(self, kcl_docs):
+        assert search_docs("   ") == [{"error": "Empty search query"}]
+
+    def test_repeat_query_is_cached(self, kcl_docs, monkeypatch):
+        first = search_docs("Extrude")
+        first[0]["title"] = "changed"
+
+        monkeypatch.setattr(
+            zoo_mcp.kcl_docs,
+            "_count_matches",
+            lambda *args: pytest.fail("search was not cached"),
+        )
+        second = search_docs(" extrude ")
+        assert second[0]["title"] == "extrude"
+        assert [r["match_count"] for r in second] == [4, 1]
+
+    def test_cache_is_per_docs_instance(self, kcl_docs, monkeypatch):
+        assert len(search_docs("extrude")) == 2
+        monkeypatch.setattr(zoo_mcp.kcl_docs, "_DOCS", KCLDocs())
+        assert search_docs("extrude") == []
+
+
+class TestExtractTitle:
+    """Tests for _extract_title."""
+
+    def test_first_heading(self):
+        assert _extract_title("intro\n## Sub\n# extrude\n# later") == "extrude"
+
+    def test_surrounding_whitespace_stripped(self):
+        assert _extract_title("  #   Fillet edges \r\nbody") == "Fillet edges"
+
+    def test_empty_heading_skipped(self):
+        assert _extract_title("# \n#\tTabbed\n# Title") == "Title"
+
+    def test_no_heading(self):
+        assert _extract_title("text # not a heading") == ""
+
+
+class TestIsSafeDocPath:
+    """Tests for _is_safe_doc_path."""
+
+    def test_valid_paths(self):
+        assert _is_safe_doc_path("docs/kcl-lang/functions.md") is True
+        assert _is_safe_doc_path("docs/kcl-std/functions/std-sketch-extrude.md") is True
+
+    def test_traversal_rejected(self):
+        assert _is_safe_doc_path("docs/../etc/passwd.md") is False
+        assert _is_safe_doc_path("docs/kcl-lang/%2e%2e%2fREADME.md") is False
+
+    def test_empty_segment_rejected(self):
+        assert _is_safe_doc_path("docs//functions.md") is False
+
+    def test_trailing_newline_rejected(self):
+        assert _is_safe_doc_path("docs/kcl-lang/functions.md\n") is False
+
+    def test_outside_docs_rejected(self):
+        assert _is_safe_doc_path("src/docs/functions.md") is False
+
+
+class TestFetchDocFiles:
+    """Tests for the file-by-file docs fallback."""
+
+    @pytest.mark.asyncio
+    async def test_lists_docs_subtree(self, httpx_mock):
+        httpx_mock.add_response(
+            url="https://api.github.com/repos/KittyCAD/modeling-app/git/trees/kcl-1:docs?recursive=1",
+            json={
+                "tree": [
+                    {"path": "kcl-lang", "type": "tree"},
+                    {"path": "kcl-lang/functions.md", "type": "blob"},
+                    {"path": "kcl-lang/../../secret.md", "type": "blob"},
+                    {"path": "logo.png", "type": "blob"},
+                ]
+            },
+        )
+        httpx_mock.add_response(
+            url="https://raw.githubusercontent.com/KittyCAD/modeling-app/kcl-1/docs/kcl-lang/functions.md",
+            text="# Functions",
+        )
+        async with httpx.AsyncClient() as client:
+            contents = await _fetch_doc_files(client, "kcl-1")
+        assert contents == {"docs/kcl-lang/functions.md": "# Functions"}
@@ -0,0 +1,179 @@
+import pytest
+
+import zoo_mcp.kcl_samples
+from zoo_mcp.kcl_samples import (
+    KCLSamples,
+    SampleMetadata,
+    _fetch_manifest_from_github,
+    get_sample_content,
+    search_samples,
+)
+from zoo_mcp.utils.data_retrieval_utils import close_github_client
+
+RAW_BASE = (
+    "https://raw.githubusercontent.com/KittyCAD/modeling-app/kcl-1/public/kcl-samples/"
+)
+
+
+class TestFetchManifest:
+    """Tests for loading the samples manifest from GitHub."""
+
+    @pytest.mark.asyncio
+    async def test_files_are_prefetched(self, httpx_mock, monkeypatch):
+        httpx_mock.add_response(
+            url="https://api.github.com/repos/KittyCAD/modeling-app/releases/latest",
+            json={"tag_name": "kcl-1"},
+        )
+        httpx_mock.add_response(
+            url=f"{RAW_BASE}manifest.json",
+            json=[
+                {
+                    "pathFromProjectDirectoryToFirstFile": "gear/main.kcl",
+                    "title": "Gear",
+                    "files": ["main.kcl", "../secret.kcl"],
+                },
+                {
+                    "pathFromProjectDirectoryToFirstFile": "bracket/main.kcl",
+                    "title": "Bracket",
+                    "files": ["main.kcl", "parts.kcl"],
+                },
+            ],
+        )
+        httpx_mock.add_response(url=f"{RAW_BASE}gear/main.kcl", text="gear()")
+        httpx_mock.add_response(url=f"{RAW_BASE}bracket/main.kcl", text="bracket()")
+        httpx_mock.add_response(url=f"{RAW_BASE}bracket/parts.kcl", text="parts()")
+
+        try:
+            samples = await _fetch_manifest_from_github()
+        finally:
+            await close_github_client()
+        assert samples.file_cache == {
+            "gear": {"main.kcl": "gear()"},
+            "bracket": {"main.kcl": "bracket()", "parts.kcl": "parts()"},
+        }
+
+        # Served from the prefetched files without further requests
+        monkeypatch.setattr(zoo_mcp.kcl_samples, "_SAMPLES", samples)
+        sample = await get_sample_content("bracket")
+        assert sample is not None
+        assert [f["filename"] for f in sample["files"]] == ["main.kcl", "parts.kcl"]
+
+    @pytest.mark.asyncio
+    async def test_complete_download_reused_on_next_load(
+        self, httpx_mock, zoo_mcp_cache_dir
+    ):
+        httpx_mock.add_response(
+            url="https://api.github.com/repos/KittyCAD/modeling-app/releases/latest",
+            json={"tag_name": "kcl-1"},
+        )
+        httpx_mock.add_response(
+            url=f"{RAW_BASE}manifest.json",
+            json=[{"pathFromProjectDirectoryToFirstFile": "gear/main.kcl"}],
+        )
+        httpx_mock.add_response(url=f"{RAW_BASE}gear/main.kcl", text="gear()")
+
+        try:
+            first = await _fetch_manifest_from_github()
+            assert (zoo_mcp_cache_dir / "samples-kcl-1.json").is_file()
+            # Served from disk, with the release tag still cached, so nothing is requested
+            second = await _fetch_manifest_from_github()
+        finally:
+            await close_github_client()
+        assert second.manifest == first.manifest
+        assert second.file_cache == {"gear": {"main.kcl": "gear()"}}
+
+    @pytest.mark.asyncio
+    async def test_incomplete_download_not_saved(self, httpx_mock, zoo_mcp_cache_dir):
+        httpx_mock.add_response(
+            url="https://api.github.com/repos/KittyCAD/modeling-app/releases/latest",
+            json={"tag_name": "kcl-1"},
+        )
+        httpx_mock.add_response(
+            url=f"{RAW_BASE}manifest.json",
+            json=[{"pathFromProjectDirectoryToFirstFile": "gear/main.kcl"}],
+        )
+        httpx_mock.add_response(url=f"{RAW_BASE}gear/main.kcl", status_code=404)
+
+        try:
+            samples = await _fetch_manifest_from_github()
+        finally:
+            await close_github_client()
+        assert samples.file_cache == {}
+        assert not (zoo_mcp_cache_dir / "samples-kcl-1.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_partial_sample_refetched_on_demand(
+        self, httpx_mock, monkeypatch, zoo_mcp_cache_dir
+    ):
+        httpx_mock.add_response(
+            url="https://api.github.com/repos/KittyCAD/modeling-app/releases/latest",
+            json={"tag_name": "kcl-1"},
+        )
+        httpx_mock.add_response(
+            url=f"{RAW_BASE}manifest.json",
+            json=[
+                {
+                    "pathFromProjectDirectoryToFirstFile": "bracket/main.kcl",
+                    "files": ["main.kcl", "parts.kcl"],
+                }
+            ],
+        )
+        httpx_mock.add_response(url=f"{RAW_BASE}bracket/main.kcl", text="bracket()")
+        httpx_mock.add_response(url=f"{RAW_BASE}bracket/parts.kcl", status_code=404)
+        httpx_mock.add_response(url=f"{RAW_BASE}bracket/main.kcl", text="bracket()")
+        httpx_mock.add_response(url=f"{RAW_BASE}bracket/parts.kcl", text="parts()")
+
+        try:
+            samples = await _fetch_manifest_from_github()
+            assert samples.file_cache == {}
+            monkeypatch.setattr(zoo_mcp.kcl_samples, "_SAMPLES", samples)
+            content = await get_sample_content("bracket")
+        finally:
+            await close_github_client()
+        assert content is not None
+        assert [f["content"] for f in content["files"]] == ["bracket()", "parts()"]
+        assert samples.file_cache == {
+            "bracket": {"main.kcl": "bracket()", "parts.kcl": "parts()"}
+        }
+
+
+def sample_metadata(name: str, title: str, description: str) -> SampleMetadata:
+    return {
+        "file": "main.kcl",
+        "pathFromProjectDirectoryToFirstFile": f"{name}/main.kcl",
+        "multipleFiles": False,
+        "title": title,
+        "description": description,
+        "files": ["main.kcl"],
+    }
+
+
+class TestSearchSamples:
+    """Tests for search_samples ranking."""
+
+    @pytest.fixture
+    def samples(self, monkeypatch):
+        samples = KCLSamples()
+        for name, title, description in [
+            ("flange", "Flange", "A gear mount"),
+            ("gear", "Gear", "A spur gear"),
+            ("rack", "Rack", "Gear rack for a gear"),
+            ("bolt", "Bolt", "A hex bolt"),
+        ]:
+            samples.add(name, sample_metadata(name, title, description))
+        monkeypatch.setattr(zoo_mcp.kcl_samples, "_SAMPLES", samples)
+        return samples
+
+    def test_title_hits_rank_first(self, samples):
+        results = search_samples("gear")
+        assert [r["name"] for r in results] == ["gear", "rack", "flange"]
+        assert [r["match_count"] for r in results] == [3, 2, 1]
+        assert all("_score" not in r for r in results)
+
+    def test_max_results(self, samples):
+        results = search_samples("gear", max_results=2)
+        assert [r["name"] for r in results] == ["gear", "rack"]
+
+    def test_ties_keep_manifest_order(self, samples):
+        results = search_samples("a ")
+        assert [r["name"] for r in results] == ["rack", "flange", "gear", "bolt"]